@@ -3,23 +3,205 @@ Hash Table Project
 Daniel Flanagan
 """
 
-from typing import TypeVar, List, Tuple
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_right
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import TypeVar, List, Tuple, Iterable, Iterator, Union, BinaryIO, TextIO, Callable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 T = TypeVar("T")
 HashNode = TypeVar("HashNode")
+CacheNode = TypeVar("CacheNode")
 HashTable = TypeVar("HashTable")
+HashCounter = TypeVar("HashCounter")
+HashTableKeys = TypeVar("HashTableKeys")
+HashTableValues = TypeVar("HashTableValues")
+HashTableItems = TypeVar("HashTableItems")
+FrozenHashTable = TypeVar("FrozenHashTable")
+ConcurrentHashTable = TypeVar("ConcurrentHashTable")
+SharedHashTable = TypeVar("SharedHashTable")
+ProbeStats = TypeVar("ProbeStats")
+RobinHoodHashTable = TypeVar("RobinHoodHashTable")
+IncrementalHashTable = TypeVar("IncrementalHashTable")
+
+# Slot states used by the array-backed storage of CompactHashTable
+_EMPTY = 0
+_LIVE = 1
+_DELETED = 2
+
+# Default for pop, distinguishing "no default given" from a default of None
+_MISSING = object()
+
+# Polynomial hashes are kept to 64 bits so long keys never build huge intermediate ints
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+# Multiplier for Fibonacci hashing, which spreads every bit of a hash into its high bits
+_FIBONACCI = 0x9E3779B97F4A7C15
+
+# Snapshot files start with this header: magic, capacity, secondary hash modulus and size. The header is followed
+# by one record of four 64 bit ints per slot: hash, key start, value start and value end, with a key start of 0
+# marking an empty slot. The UTF-8 keys and pickled values follow the slot records, addressed by those offsets
+_SNAPSHOT_MAGIC = b"HTSNAP01"
+_SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+_SNAPSHOT_SLOT_WIDTH = 4
+
+# Batches smaller than this are hashed in pure Python, larger ones are vectorized in chunks of this many keys
+_VECTORIZE_MIN = 64
+_VECTORIZE_CHUNK = 1024
+# Keys longer than this are hashed in pure Python, so one long key cannot widen the padded matrix of its chunk
+_VECTORIZE_MAX_WIDTH = 256
+
+
+def _hash_string(key: str) -> int:
+    """
+    Computes the full polynomial hash of a key, which both probe values are derived from
+    :param key: key to be hashed
+    :return: 64 bit hash of the key
+    """
+    hashed_value = 0
+    for char in key:
+        hashed_value = (181 * hashed_value + ord(char)) & _HASH_MASK
+    return hashed_value
+
+
+def _hash_strings(keys: List[str]) -> List[int]:
+    """
+    Computes the full polynomial hash of every key in a batch. With NumPy available each chunk of keys is padded
+    on the left with NUL characters, which leave the hash unchanged, and hashed as one matrix product of the
+    character codes with the powers of 181, using wrapping 64 bit arithmetic. Keys longer than
+    _VECTORIZE_MAX_WIDTH are hashed one at a time
+    :param keys: list of keys to be hashed
+    :return: list of 64 bit hashes, in the same order as keys
+    """
+    if np is None or len(keys) < _VECTORIZE_MIN:
+        return [_hash_string(key) for key in keys]
+    width = max(map(len, keys))
+    if width > _VECTORIZE_MAX_WIDTH:
+        hashes = [_hash_string(key) if len(key) > _VECTORIZE_MAX_WIDTH else None for key in keys]
+        short = [i for i, hashed in enumerate(hashes) if hashed is None]
+        for i, hashed in zip(short, _hash_strings([keys[i] for i in short])):
+            hashes[i] = hashed
+        return hashes
+    powers = []
+    power = 1
+    for _ in range(width):
+        powers.append(power)
+        power = (power * 181) & _HASH_MASK
+    powers = np.array(powers[::-1], dtype=np.uint64)
+    hashes = []
+    for start in range(0, len(keys), _VECTORIZE_CHUNK):
+        chunk = keys[start:start + _VECTORIZE_CHUNK]
+        chunk_width = max(map(len, chunk))
+        if chunk_width == 0:
+            hashes.extend([0] * len(chunk))
+            continue
+        encoded = "".join([key.rjust(chunk_width, "\0") for key in chunk]).encode("utf-32-le", "surrogatepass")
+        codes = np.frombuffer(encoded, dtype=np.uint32).reshape(len(chunk), chunk_width)
+        hashes.extend((codes.astype(np.uint64) @ powers[width - chunk_width:]).tolist())
+    return hashes
+
+
+def _is_prime(n: int) -> bool:
+    """
+    Deterministic Miller-Rabin primality test, exact for every n below 3.3 * 10^24
+    :param n: number to test
+    :return: bool indicating whether n is prime
+    """
+    if n < 2:
+        return False
+    for prime in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % prime == 0:
+            return n == prime
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for base in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _prime_at_most(n: int) -> int:
+    """
+    Finds the secondary hash modulus for a capacity, looked up in HashTable.primes when it is large enough
+    and computed otherwise
+    :param n: capacity of a hash table
+    :return: largest prime less than or equal to n, or 2 if n is smaller than 2
+    """
+    primes = HashTable.primes
+    if n <= primes[-1]:
+        return primes[max(bisect_right(primes, n) - 1, 0)]
+    candidate = n if n % 2 == 1 else n - 1
+    while not _is_prime(candidate):
+        candidate -= 2
+    return candidate
+
+
+def _length_hint(iterable: Iterable) -> int:
+    """
+    Finds the length of an iterable without consuming it
+    :param iterable: any iterable
+    :return: len(iterable), or None for iterables such as generators that have no length
+    """
+    try:
+        return len(iterable)
+    except TypeError:
+        return None
+
+
+def _capacity_for(count: int) -> int:
+    """
+    Finds the capacity a table needs to hold count entries without growing
+    :param count: number of entries
+    :return: smallest power of two more than twice count, and at least HashTable.MIN_CAPACITY
+    """
+    return max(_round_capacity(2 * count + 1), HashTable.MIN_CAPACITY)
+
+
+def _round_capacity(capacity: int) -> int:
+    """
+    Rounds a requested capacity up to a power of two, so every odd probe step visits every slot
+    :param capacity: requested capacity
+    :return: smallest power of two no less than capacity, and at least 2
+    """
+    return 1 << max(capacity - 1, 1).bit_length()
 
 
 class HashNode:
     """
     Hash Node Class
     """
-    __slots__ = ["key", "value", "deleted"]
+    __slots__ = ["key", "value", "deleted", "hash"]
 
-    def __init__(self, key: str, value: T, deleted: bool = False) -> None:
+    def __init__(self, key: str, value: T, deleted: bool = False, hashed: int = None) -> None:
         self.key = key
         self.value = value
         self.deleted = deleted
+        if hashed is None and key is not None:
+            hashed = _hash_string(key)
+        self.hash = hashed
 
     def __str__(self) -> str:
         return f"HashNode({self.key}, {self.value})"
@@ -29,15 +211,38 @@ class HashNode:
     def __eq__(self, other: HashNode) -> bool:
         return self.key == other.key and self.value == other.value
 
-    def __iadd__(self, other: T) -> None:
+    def __iadd__(self, other: T) -> HashNode:
         self.value += other
+        return self
+
+
+class CacheNode(HashNode):
+    """
+    Hash Node Class for CacheTable, linked into the table's recency list
+    """
+    __slots__ = ["prev", "next", "expires", "nbytes"]
+
+    def __init__(self, key: str, value: T, deleted: bool = False, hashed: int = None) -> None:
+        super().__init__(key, value, deleted, hashed)
+        # A node starts out linked to itself, which is also how an unlinked node is left
+        self.prev = self
+        self.next = self
+        self.expires = None
+        self.nbytes = 0
 
 
 class HashTable:
     """
     Hash Table Class
     """
-    __slots__ = ['capacity', 'size', 'table', 'prime_index']
+    __slots__ = ['capacity', 'size', 'table', 'prime', 'tombstones', 'version', 'probe_stats', 'reserved']
+
+    # Smallest capacity the table will shrink or clear down to
+    MIN_CAPACITY = 8
+    # Fraction of slots that may hold tombstones before the table is compacted in place
+    TOMBSTONE_RATIO = 0.25
+    # Load factor below which a deletion shrinks the table
+    SHRINK_RATIO = 0.125
 
     primes = (
         2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103, 107,
@@ -98,16 +303,15 @@ class HashTable:
     def __init__(self, capacity: int = 8) -> None:
         """
         Initializes hash table
-        :param capacity: capacity of the hash table
+        :param capacity: capacity of the hash table, rounded up to a power of two. Deletions never shrink the
+        table below it
         """
-        self.capacity = capacity
         self.size = 0
-        self.table = [None] * capacity
-
-        i = 0
-        while HashTable.primes[i] <= self.capacity:
-            i += 1
-        self.prime_index = i - 1
+        self.tombstones = 0
+        self.version = 0
+        self.probe_stats = None
+        self.reserved = _round_capacity(capacity)
+        self._set_capacity(self.reserved)
 
     def __eq__(self, other: HashTable) -> bool:
         """
@@ -122,6 +326,20 @@ class HashTable:
                 return False
         return True
 
+    def _same_entries(self, other: HashTable) -> bool:
+        """
+        Compares this table with one whose slots are laid out differently, by capacity, size and entries
+        :param other: other hash table we are comparing with this one
+        :return: bool if both hold the same keys with equal values
+        """
+        if self.capacity != other.capacity or self.size != other.size:
+            return False
+        for key, value in self._iter_items():
+            node = other._get(key)
+            if node is None or not (node.value is value or node.value == value):
+                return False
+        return True
+
     def __str__(self) -> str:
         """
         Represents the table as a string
@@ -136,36 +354,42 @@ class HashTable:
 
     __repr__ = __str__
 
-    def _hash_1(self, key: str) -> int:
+    def _hash_1(self, key: str, hashed: int = None) -> int:
         """
         Converts a string x into a bin number for our hash table
         :param key: key to be hashed
+        :param hashed: precomputed full hash of key, computed from key if not given
         :return: bin number to insert hash item at in our table, None if key is an empty string
         """
         if not key:
             return None
-        hashed_value = 0
-
-        for char in key:
-            hashed_value = 181 * hashed_value + ord(char)
-        return hashed_value % self.capacity
+        if hashed is None:
+            hashed = _hash_string(key)
+        return hashed % self.capacity
 
-    def _hash_2(self, key: str) -> int:
+    def _hash_2(self, key: str, hashed: int = None) -> int:
         """
         Converts a string x into a hash
         :param key: key to be hashed
+        :param hashed: precomputed full hash of key, computed from key if not given
         :return: a hashed value
         """
         if not key:
             return None
-        hashed_value = 0
+        if hashed is None:
+            hashed = _hash_string(key)
+        return self._step(hashed)
 
-        for char in key:
-            hashed_value = 181 * hashed_value + ord(char)
-
-        prime = HashTable.primes[self.prime_index]
+    def _step(self, hashed: int) -> int:
+        """
+        Derives the double hashing probe step from a full hash. The step is odd and the capacity is a
+        power of two, so they are coprime and every probe sequence reaches every slot
+        :param hashed: full hash of a key
+        :return: probe step, always odd
+        """
+        prime = self.prime
 
-        hashed_value = prime - (hashed_value % prime)
+        hashed_value = prime - (hashed % prime)
         if hashed_value % 2 == 0:
             hashed_value += 1
         return hashed_value
@@ -207,7 +431,7 @@ class HashTable:
         if node is None:
             raise KeyError(key)
         else:
-            self._delete(key)
+            self._remove(node)
 
     def __contains__(self, key: str) -> bool:
         """
@@ -220,71 +444,156 @@ class HashTable:
             return False
         return True
 
-    def _hash(self, key: str, inserting: bool = False) -> int:
+    def _hash(self, key: str, inserting: bool = False, hashed: int = None) -> int:
         """
-        Searches for the index of a key in the hash table, or for the index of the next empty node
+        Searches for the index of a key in the hash table, or for the index of the next empty node.
+        When inserting, the first tombstone along the probe sequence is reused unless the key appears after it
         :param key: Key being searched for
         :param inserting: bool indicating if the search is for inserting or locating an index
+        :param hashed: precomputed full hash of key, computed from key if not given
         :return: Index of key, next empty node, or None if neither exist
         """
-        i = 0
-        while i < self.capacity:
-            index = (self._hash_1(key) + (i * self._hash_2(key))) % self.capacity
-            node = self.table[index]
-            if inserting is False:
-                if node is not None:
-                    if node.key == key:
-                        return index
-                elif node is None:
-                    return index
-            elif inserting is True:
-                if node is None or node.deleted is True:
-                    return index
-                elif node.key == key:
-                    return index
-            i += 1
-        return None
+        if hashed is None:
+            hashed = _hash_string(key)
+        capacity = self.capacity
+        table = self.table
+        index = hashed % capacity
+        step = self._step(hashed)
+        free = None
+        for probes in range(1, capacity + 1):
+            node = table[index]
+            if node is None:
+                if free is not None:
+                    index = free
+                break
+            if node.deleted is True:
+                if inserting is True and free is None:
+                    free = index
+            elif node.hash == hashed and node.key == key:
+                break
+            index = (index + step) % capacity
+        else:
+            index = free
+        if self.probe_stats is not None:
+            self.probe_stats.record_probe(key, probes, inserting, index is not None and table[index] is not None)
+        return index
 
-    def _insert(self, key: str, value: T) -> None:
+    def _insert(self, key: str, value: T, hashed: int = None) -> None:
         """
         Uses Key Value parameters to add a HashNode to the HashTable
         :param key: Key for HashNode
         :param value: Value for Hashnode
+        :param hashed: precomputed full hash of key, computed from key if not given
         :return: None
         """
-        key_index = self._hash(key, True)
-        if self.table[key_index] is None or self.table[key_index].deleted is True:
-            self.size = self.size + 1
-            self.table[key_index] = HashNode(key, value, False)
-        elif self.table[key_index].key == key:
-            self.table[key_index].value = value
+        if hashed is None:
+            hashed = _hash_string(key)
+        key_index = self._hash(key, True, hashed)
+        node = self.table[key_index]
+        if node is None or node.deleted is True:
+            self._insert_at(key_index, key, value, hashed)
+        else:
+            node.value = value
+
+    def _insert_at(self, key_index: int, key: str, value: T, hashed: int) -> None:
+        """
+        Adds a new HashNode at the empty slot or tombstone that _hash found for it, then grows or compacts the
+        table if needed
+        :param key_index: Index returned by _hash when inserting key
+        :param key: Key for HashNode
+        :param value: Value for HashNode
+        :param hashed: full hash of key
+        :return: None
+        """
+        if self.table[key_index] is not None:
+            self.tombstones = self.tombstones - 1
+        self.size = self.size + 1
+        self.version = self.version + 1
+        self.table[key_index] = HashNode(key, value, False, hashed)
         if self.size >= (self.capacity / 2):
             self._grow()
+        elif self.tombstones > self.capacity * self.TOMBSTONE_RATIO:
+            self._rehash(self.capacity)
 
-    def _get(self, key: str) -> HashNode:
+    def _get(self, key: str, hashed: int = None) -> HashNode:
         """
         Find HashNode with key argument as its key
         :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
         :return: HashNode with Key, or None if not found
         """
-        key_index = self._hash(key)
+        key_index = self._hash(key, False, hashed)
         if key_index is None:
             return None
         else:
             return self.table[key_index]
 
-    def _delete(self, key: str) -> None:
+    def _delete(self, key: str, hashed: int = None) -> None:
         """
-        Remove HashNode with key argument as its key
+        Remove HashNode with key argument as its key, leaving a tombstone in its slot. Compacts the table once
+        tombstones pass TOMBSTONE_RATIO of the slots, and shrinks it once the load falls below SHRINK_RATIO
         :param key: key of HashNode to remove
+        :param hashed: precomputed full hash of key, computed from key if not given
         :return: None
         """
-        node = self._get(key)
+        node = self._get(key, hashed)
         if node is not None:
-            node.key = None
-            node.value = None
-            node.deleted = True
-            self.size = self.size - 1
+            self._remove(node)
+
+    def _remove(self, node: HashNode) -> None:
+        """
+        Turns a live node into a tombstone, then compacts or shrinks the table if needed
+        :param node: live HashNode in this table
+        :return: None
+        """
+        node.key = None
+        node.value = None
+        node.deleted = True
+        self.size = self.size - 1
+        self.version = self.version + 1
+        self.tombstones = self.tombstones + 1
+        if self.probe_stats is not None:
+            self.probe_stats.record_delete(self.tombstones)
+        self._shrink()
+
+    def _shrink(self) -> None:
+        """
+        Rehashes the table after deletions, into a smaller table if the load is low enough and in place
+        if only the tombstones need reclaiming. The table never shrinks below the capacity it was created or
+        reserved with
+        :return: None
+        """
+        floor = max(self.reserved, self.MIN_CAPACITY)
+        if self.size < self.capacity * self.SHRINK_RATIO and self.capacity > floor:
+            self._rehash(max(_round_capacity(self.size * 4), floor))
+        elif self.tombstones > self.capacity * self.TOMBSTONE_RATIO:
+            self._rehash(self.capacity)
+
+    def _place(self, node: HashNode) -> None:
+        """
+        Puts a live node into the first free slot of its probe sequence using its cached hash.
+        Only valid while the table holds no tombstones and does not already contain the key
+        :param node: HashNode to place
+        :return: None
+        """
+        capacity = self.capacity
+        table = self.table
+        index = node.hash % capacity
+        step = self._step(node.hash)
+        while table[index] is not None:
+            index = (index + step) % capacity
+        table[index] = node
+
+    def _set_capacity(self, capacity: int) -> None:
+        """
+        Replaces the table with an empty one of the given capacity and picks its secondary hash modulus
+        :param capacity: new capacity, a power of two
+        :return: None
+        """
+        self.capacity = capacity
+        self.prime = _prime_at_most(capacity)
+        self.table = [None] * capacity
+        self.version = self.version + 1
 
     def _grow(self) -> None:
         """
@@ -292,176 +601,2543 @@ class HashTable:
         :param: None
         :return: None
         """
+        if self.probe_stats is None:
+            self._rehash(self.capacity * 2)
+            return
+        start = time.perf_counter()
+        self._rehash(self.capacity * 2)
+        self.probe_stats.record_grow(self.capacity, time.perf_counter() - start)
+
+    def _rehash(self, capacity: int) -> None:
+        """
+        Rebuilds the table at the given capacity, dropping tombstones and moving live nodes without
+        rehashing their keys
+        :param capacity: new capacity, a power of two
+        :return: None
+        """
         old_table = self.table
-        i = 0
-        self.size = 0
-        self.capacity = self.capacity * 2
-        while HashTable.primes[i] <= self.capacity:
-            i += 1
-        self.prime_index = i - 1
-        self.table = [None] * self.capacity
+        self._set_capacity(capacity)
+        self.tombstones = 0
         for old_node in old_table:
             if old_node is not None and old_node.deleted is False:
-                self._insert(old_node.key, old_node.value)
+                self._place(old_node)
+
+    @classmethod
+    def from_items(cls, iterable: Iterable[Tuple[str, T]], expected_size: int = None) -> HashTable:
+        """
+        Builds a table from key value pairs, sized up front so loading never triggers a grow
+        :param iterable: Iterable of key value tuples, generators are consumed without being materialized
+        :param expected_size: Number of pairs expected, taken from len(iterable) when not given and available
+        :return: New table holding the pairs
+        """
+        if expected_size is None:
+            expected_size = _length_hint(iterable)
+        table = cls()
+        if expected_size:
+            table._reserve(expected_size)
+        table.update(iterable)
+        return table
 
-    def update(self, pairs: List[Tuple[str, T]] = []) -> None:
+    def _reserve(self, count: int) -> None:
         """
-        Updates Hash Table using an iterable of key value pairs
-        :param pairs: A list of tuples holding key value pairs
+        Resizes the table once so that it can hold count entries without growing, and keeps deletions from
+        shrinking it below that size
+        :param count: Number of entries the table must hold
         :return: None
         """
-        for values in pairs:
-            self._insert(values[0], values[1])
+        if count >= self.capacity / 2:
+            self._rehash(_capacity_for(count))
+            self.reserved = max(self.reserved, self.capacity)
 
-    def keys(self) -> List[str]:
+    def update(self, pairs: Iterable[Tuple[str, T]] = None) -> None:
         """
-        Makes a list that contains all keys in the table
-        :return: list of keys
+        Updates Hash Table using an iterable of key value pairs. When the number of pairs is known the table is
+        resized once up front, and pairs are hashed in batches without materializing the whole iterable
+        :param pairs: An iterable of tuples holding key value pairs
+        :return: None
         """
-        keys = []
-        for node in self.table:
-            if node is not None and node.deleted is False:
-                keys.append(node.key)
-        return keys
+        if pairs is None:
+            return
+        count = _length_hint(pairs)
+        if count:
+            self._reserve(self.size + count)
+        iterator = iter(pairs)
+        while True:
+            chunk = list(islice(iterator, _VECTORIZE_CHUNK))
+            if not chunk:
+                break
+            self.set_many(chunk)
 
-    def values(self) -> List[T]:
+    def __iter__(self) -> Iterator[str]:
         """
-        Makes a list that contains all values in the table
-        :return: list of values
+        Iterates over the keys in the table without copying them
+        :return: iterator of keys
         """
-        values = []
-        for node in self.table:
-            if node is not None and node.deleted is False:
-                values.append(node.value)
-        return values
+        return self._iter_keys()
 
-    def items(self) -> List[Tuple[str, T]]:
+    def _iter_nodes(self) -> Iterator[HashNode]:
         """
-        Makes a list that contains all key value pairs in the table
-        :return: List of key value pairs
+        Yields the live nodes of the table in slot order
+        :return: generator of HashNodes, raising RuntimeError if the table is resized, or gains or loses keys,
+        while it is being iterated
         """
-        pairs = []
+        version = self.version
         for node in self.table:
             if node is not None and node.deleted is False:
-                pair = (node.key, node.value)
-                pairs.append(pair)
-        return pairs
+                yield node
+                if self.version != version:
+                    raise RuntimeError("HashTable changed size during iteration")
 
-    def clear(self) -> None:
+    def _iter_keys(self) -> Iterator[str]:
         """
-        Resets the nodes in the HashTable to None
-        :return: None
+        Lazily iterates over the keys in the table
+        :return: generator of keys
         """
-        self.table = [None] * self.capacity
-        self.size = 0
+        return (node.key for node in self._iter_nodes())
+
+    def _iter_values(self) -> Iterator[T]:
+        """
+        Lazily iterates over the values in the table
+        :return: generator of values
+        """
+        return (node.value for node in self._iter_nodes())
 
+    def _iter_items(self) -> Iterator[Tuple[str, T]]:
+        """
+        Lazily iterates over the key value pairs in the table
+        :return: generator of key value pairs
+        """
+        return ((node.key, node.value) for node in self._iter_nodes())
 
-def display_duplicates(data: List[List[str]], filenames: List[str]) -> HashTable:
-    """
-    Displays duplicate images represented by a HashTable, by placing duplicates in a list held in the value
-    of the hash node. Keys are the filenames of the first occurrence of an image.
-    Words for any duplicate string, but my use case was for image names.
-    :param data: A list of lists of four hash strings corresponding to the hash results of each image, rotated
-    by 0, 90, 180 and 270 degrees
-    :param filenames: Corresponding filenames of images whose hash info lies in data
-    :return: HashTable detailing image duplicate information
-    """
+    def _iter_hashed(self) -> Iterator[Tuple[int, str, T]]:
+        """
+        Lazily iterates over the entries in the table along with their cached hashes
+        :return: generator of (hash, key, value) tuples
+        """
+        return ((node.hash, node.key, node.value) for node in self._iter_nodes())
 
-    # A list of tuples. Each tuple holds 2 indices, 1st index = original, 2nd index = dupe index
-    dupe_indices = []
+    def keys(self) -> HashTableKeys:
+        """
+        Makes a live view of all keys in the table
+        :return: view of keys
+        """
+        return HashTableKeys(self)
 
-    find_dupes = HashTable()
-    images = HashTable()
+    def values(self) -> HashTableValues:
+        """
+        Makes a live view of all values in the table
+        :return: view of values
+        """
+        return HashTableValues(self)
 
-    for i, inner in enumerate(data):
-        il1 = inner[0] + inner[1] + inner[2] + inner[3]
-        il2 = inner[1] + inner[2] + inner[3] + inner[0]
-        il3 = inner[2] + inner[3] + inner[0] + inner[1]
-        il4 = inner[3] + inner[0] + inner[1] + inner[2]
+    def items(self) -> HashTableItems:
+        """
+        Makes a live view of all key value pairs in the table
+        :return: view of key value pairs
+        """
+        return HashTableItems(self)
 
-        if il1 in find_dupes:
-            dupe_indices.append((find_dupes[il1], i))
-            continue
-        else:
-            find_dupes[il1] = i
+    def get(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key with a single probe sequence
+        :param key: key used to find the value
+        :param default: value returned if key is not in the table
+        :return: value associated with key, or default
+        """
+        node = self._get(key)
+        if node is None:
+            return default
+        return node.value
 
-        if il2 in find_dupes:
-            dupe_indices.append((find_dupes[il2], i))
-            continue
-        else:
-            find_dupes[il2] = i
+    def setdefault(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key, inserting default first if key is missing, with a single probe sequence
+        :param key: key used to find the value
+        :param default: value inserted if key is not in the table
+        :return: value associated with key
+        """
+        hashed = _hash_string(key)
+        key_index = self._hash(key, True, hashed)
+        node = self.table[key_index]
+        if node is None or node.deleted is True:
+            self._insert_at(key_index, key, default, hashed)
+            return default
+        return node.value
 
-        if il3 in find_dupes:
-            dupe_indices.append((find_dupes[il3], i))
-            continue
-        else:
-            find_dupes[il3] = i
+    def pop(self, key: str, default: T = _MISSING) -> T:
+        """
+        Removes key and returns its value, with a single probe sequence
+        :param key: key of the entry to remove
+        :param default: value returned if key is not in the table, KeyError is raised if not given
+        :return: value that was associated with key, or default
+        """
+        node = self._get(key)
+        if node is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = node.value
+        self._remove(node)
+        return value
 
-        if il4 in find_dupes:
-            dupe_indices.append((find_dupes[il4], i))
-            continue
-        else:
-            find_dupes[il4] = i
+    def increment(self, key: str, delta: T = 1) -> T:
+        """
+        Adds delta to the value of key in place, inserting delta if key is missing, with a single probe sequence
+        :param key: key of the entry to update
+        :param delta: amount added to the value
+        :return: new value associated with key
+        """
+        return self._increment(key, delta, _hash_string(key))
 
-    for i, filename in enumerate(filenames):
-        if any(i in indices for indices in dupe_indices):
-            continue
-        else:
-            images[filename] = []
+    def _increment(self, key: str, delta: T, hashed: int) -> T:
+        """
+        Adds delta to the value of key in place, inserting delta if key is missing
+        :param key: key of the entry to update
+        :param delta: amount added to the value
+        :param hashed: full hash of key
+        :return: new value associated with key
+        """
+        key_index = self._hash(key, True, hashed)
+        node = self.table[key_index]
+        if node is None or node.deleted is True:
+            self._insert_at(key_index, key, delta, hashed)
+            return delta
+        node.value += delta
+        return node.value
 
-    for original, dupe in dupe_indices:
-        if filenames[original] not in images:
-            images[filenames[original]] = [filenames[dupe]]
-        else:
-            images[filenames[original]].append(filenames[dupe])
+    def _find_or_insert(self, key: str, value: T, hashed: int) -> HashNode:
+        """
+        Finds the node of key, inserting value first if key is missing. A missing key is probed again to insert it,
+        for engines whose _hash cannot hand back the slot to insert at
+        :param key: key used to find the node
+        :param value: value inserted if key is not in the table
+        :param hashed: full hash of key
+        :return: HashNode of key if it was already in the table, or None if value was inserted
+        """
+        node = self._get(key, hashed)
+        if node is None:
+            self._insert(key, value, hashed)
+        return node
 
-    return images
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Looks up a batch of keys, hashing them all at once before probing
+        :param keys: Iterable of keys to look up
+        :param default: Value returned for keys that are not in the table
+        :return: List of values in the same order as keys
+        """
+        keys = list(keys)
+        if self.probe_stats is not None:
+            # The probe loop below is inlined for speed, so route through _hash while instrumented
+            nodes = [self._get(key, hashed) for key, hashed in zip(keys, _hash_strings(keys))]
+            return [default if node is None else node.value for node in nodes]
+        table = self.table
+        capacity = self.capacity
+        prime = self.prime
+        results = []
+        for key, hashed in zip(keys, _hash_strings(keys)):
+            index = hashed % capacity
+            step = (prime - hashed % prime) | 1
+            while True:
+                node = table[index]
+                if node is None:
+                    results.append(default)
+                    break
+                if node.hash == hashed and node.key == key and node.deleted is False:
+                    results.append(node.value)
+                    break
+                index = (index + step) % capacity
+        return results
 
+    def contains_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Checks a batch of keys for membership, hashing them all at once before probing
+        :param keys: Iterable of keys to check for
+        :return: List of bools in the same order as keys
+        """
+        missing = object()
+        return [value is not missing for value in self.get_many(keys, missing)]
 
-def get_permutations(words: List[str]) -> HashTable:
-    """
-    A helper function for locate_substrings that creates a HashTable of each word in words
-    :param words: A list of strings to be added to a HashTable. The count of each word is its value.
-    :return: A hashtable with each word in words and their number of occurrences
-    """
-    permutations = HashTable()
-    for word in words:
-        if word in permutations:
-            permutations[word] = permutations[word] + 1
+    def set_many(self, pairs: Iterable[Tuple[str, T]]) -> None:
+        """
+        Inserts or updates a batch of key value pairs, hashing all keys at once before probing
+        :param pairs: Iterable of key value tuples
+        :return: None
+        """
+        pairs = list(pairs)
+        hashes = _hash_strings([pair[0] for pair in pairs])
+        for (key, value), hashed in zip(pairs, hashes):
+            self._insert(key, value, hashed)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Deletes a batch of keys, hashing them all at once before probing. Missing keys are skipped
+        :param keys: Iterable of keys to delete
+        :return: Number of keys that were deleted
+        """
+        keys = list(keys)
+        size = self.size
+        for key, hashed in zip(keys, _hash_strings(keys)):
+            self._delete(key, hashed)
+        return size - self.size
+
+    def enable_stats(self, callback: Callable[[str, dict], None] = None, top: int = 10) -> ProbeStats:
+        """
+        Starts collecting probe and resize statistics, which cost one attribute check per operation while disabled
+        :param callback: Optional callable invoked with an event name and its details for every recorded event
+        :param top: Number of keys with the longest probe chains to keep
+        :return: The ProbeStats collecting the statistics
+        """
+        self.probe_stats = ProbeStats(callback, top)
+        return self.probe_stats
+
+    def disable_stats(self) -> None:
+        """
+        Stops collecting statistics and discards those collected
+        :return: None
+        """
+        self.probe_stats = None
+
+    def stats(self) -> dict:
+        """
+        Reports the table's load, plus the collected probe and resize statistics if enable_stats was called
+        :return: dict of statistics
+        """
+        report = {
+            "size": self.size,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "tombstones": self.tombstones,
+        }
+        if self.probe_stats is not None:
+            report.update(self.probe_stats.report())
+        return report
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Writes the table to a binary snapshot file that load can serve lookups from without rehashing. Keys are
+        stored as UTF-8 and values are pickled
+        :param path: Path of the snapshot file to write
+        :return: None
+        """
+        slots, blobs = _snapshot_layout(self)
+        with open(path, "wb") as file:
+            file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self.capacity, self.prime, self.size))
+            file.write(slots.tobytes())
+            for blob in blobs:
+                file.write(blob)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmap: bool = True) -> HashTable:
+        """
+        Reads a snapshot file written by save
+        :param path: Path of the snapshot file
+        :param mmap: bool indicating whether to memory-map the file and serve lookups from it directly, or to copy
+        it into a new mutable table of this class
+        :return: A read-only FrozenHashTable over the mapped file, or a new table of this class
+        """
+        frozen = FrozenHashTable.open(path)
+        if mmap is True:
+            return frozen
+        with frozen:
+            table = cls(frozen.capacity)
+            for hashed, key, value in frozen._iter_hashed():
+                table._insert(key, value, hashed)
+        return table
+
+    def clear(self, shrink: bool = False) -> None:
+        """
+        Resets the nodes in the HashTable to None
+        :param shrink: bool indicating whether to release memory by shrinking the table to MIN_CAPACITY
+        :return: None
+        """
+        if shrink is True:
+            self._set_capacity(self.MIN_CAPACITY)
         else:
-            permutations[word] = 1
-    return permutations
+            self._set_capacity(self.capacity)
+        self.size = 0
+        self.tombstones = 0
+
+    def memory_usage(self) -> dict:
+        """
+        Reports the bytes used by the table's storage, not counting the key and value objects themselves
+        :return: dict mapping each storage component to its size in bytes, plus their total
+        """
+        nodes = 0
+        for node in self.table:
+            if node is not None:
+                nodes += sys.getsizeof(node)
+        usage = {"slots": sys.getsizeof(self.table), "nodes": nodes}
+        usage["total"] = sum(usage.values())
+        return usage
 
 
-def compare_tables(hash_table1, hash_table2):
+class ProbeStats:
     """
-    Compares two hash tables but does not terminate the program if one has None at the index that the other has
-    a Node
-    :param hash_table1: First HashTable to compare
-    :param hash_table2: Second HashTable to compare
-    :return: Bool representing whether the HashTables are equivalent
+    Statistics collected by an instrumented HashTable: probe length histograms for hits, misses and inserts,
+    deletions, grows and the time each took, and the keys with the longest probe chains
     """
-    if len(hash_table1) != len(hash_table2):
-        return False
+    __slots__ = ['hits', 'misses', 'inserts', 'deletes', 'max_tombstones', 'grows', 'grow_seconds', 'longest',
+                 'top', 'callback']
 
-    keys = hash_table1.keys()
-    for key in keys:
-        if key not in hash_table2:
-            return False
+    def __init__(self, callback: Callable[[str, dict], None] = None, top: int = 10) -> None:
+        """
+        Initializes empty statistics
+        :param callback: Optional callable invoked with an event name and its details for every recorded event
+        :param top: Number of keys with the longest probe chains to keep
+        """
+        self.hits = {}
+        self.misses = {}
+        self.inserts = {}
+        self.deletes = 0
+        self.max_tombstones = 0
+        self.grows = 0
+        self.grow_seconds = []
+        self.longest = {}
+        self.top = top
+        self.callback = callback
 
-    for key in keys:
-        if hash_table1[key] != hash_table2[key]:
-            return False
+    def record_probe(self, key: str, probes: int, inserting: bool, found: bool) -> None:
+        """
+        Records one probe sequence
+        :param key: key that was searched for
+        :param probes: number of slots examined
+        :param inserting: bool indicating if the search was for an insert
+        :param found: bool indicating if the search ended on a live entry
+        :return: None
+        """
+        if inserting is True:
+            kind, histogram = "insert", self.inserts
+        elif found is True:
+            kind, histogram = "hit", self.hits
+        else:
+            kind, histogram = "miss", self.misses
+        histogram[probes] = histogram.get(probes, 0) + 1
+        longest = self.longest
+        if key in longest:
+            if probes > longest[key]:
+                longest[key] = probes
+        elif len(longest) < self.top:
+            longest[key] = probes
+        else:
+            shortest = min(longest, key=longest.get)
+            if probes > longest[shortest]:
+                del longest[shortest]
+                longest[key] = probes
+        if self.callback is not None:
+            self.callback(kind, {"key": key, "probes": probes})
 
-    return True
+    def record_delete(self, tombstones: int) -> None:
+        """
+        Records one deletion
+        :param tombstones: number of tombstones in the table after the deletion
+        :return: None
+        """
+        self.deletes += 1
+        self.max_tombstones = max(self.max_tombstones, tombstones)
+        if self.callback is not None:
+            self.callback("delete", {"tombstones": tombstones})
 
+    def record_grow(self, capacity: int, seconds: float) -> None:
+        """
+        Records one grow
+        :param capacity: capacity after the grow
+        :param seconds: time the grow took
+        :return: None
+        """
+        self.grows += 1
+        self.grow_seconds.append(seconds)
+        if self.callback is not None:
+            self.callback("grow", {"capacity": capacity, "seconds": seconds})
 
-def locate_substrings(text: str, words: List[str]) -> List[int]:
-    """
-    Finds all the index positions within a string where permutations of a list of words exists in consecutive order,
-    use cases include searching for single or multiple words within a text in any consecutive order. Locates substring
-    in O(K * W * N), where N is the length of the text parameter, K is the number of elements within words, and W is the
-    length of each word within words. Has a constraint of requiring words being searched for of the same length.
+    def report(self) -> dict:
+        """
+        Summarizes the statistics
+        :return: dict of histograms, counters, grow times and the longest probe chains, longest first
+        """
+        return {
+            "hits": dict(sorted(self.hits.items())),
+            "misses": dict(sorted(self.misses.items())),
+            "inserts": dict(sorted(self.inserts.items())),
+            "deletes": self.deletes,
+            "max_tombstones": self.max_tombstones,
+            "grows": self.grows,
+            "grow_seconds": list(self.grow_seconds),
+            "longest_chains": sorted(self.longest.items(), key=lambda item: item[1], reverse=True),
+        }
+
+
+class CompactHashTable(HashTable):
+    """
+    Hash Table with the same API as HashTable that stores slots in parallel arrays instead of HashNode objects.
+    Cached hashes and slot states live in compact typed arrays, keys and values in two plain lists
+    """
+    __slots__ = ['hashes', 'states', 'slot_keys', 'slot_values']
+
+    def __eq__(self, other: HashTable) -> bool:
+        """
+        Equality operator. Tables of other storage engines are compared by their entries in slot order
+        :param other: other hash table we are comparing with this one
+        :return: bool if equal or not
+        """
+        if self.capacity != other.capacity or self.size != other.size:
+            return False
+        if not isinstance(other, CompactHashTable):
+            return list(self.items()) == list(other.items())
+        return (self.states == other.states and self.slot_keys == other.slot_keys
+                and self.slot_values == other.slot_values)
+
+    def __str__(self) -> str:
+        """
+        Represents the table as a string
+        :return: string representation of the hash table
+        """
+        lines = []
+        for i in range(self.capacity):
+            if self.states[i] == _EMPTY:
+                item = None
+            else:
+                item = HashNode(self.slot_keys[i], self.slot_values[i], self.states[i] == _DELETED, self.hashes[i])
+            lines.append("[" + str(i) + "]: " + str(item) + '\n')
+        return "".join(lines)
+
+    __repr__ = __str__
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Gets value from key if it exists, otherwise raises KeyError
+        :param key: key used to find the value
+        :return: value associated with key
+        """
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        return self.slot_values[index]
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes the entry associated with key argument
+        :param key: key used to indicate entry for deletion
+        :return: None
+        """
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        self._delete_index(index)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Determines if an entry with the key denoted by the parameter exists
+        :param key: Key being checked for in table
+        :return: Bool indicating whether the key was found
+        """
+        return self._find(key) is not None
+
+    def _hash(self, key: str, inserting: bool = False, hashed: int = None) -> int:
+        """
+        Searches for the index of a key in the hash table, or for the index of the next empty slot.
+        When inserting, the first tombstone along the probe sequence is reused unless the key appears after it
+        :param key: Key being searched for
+        :param inserting: bool indicating if the search is for inserting or locating an index
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: Index of key, next empty slot, or None if neither exist
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        capacity = self.capacity
+        states = self.states
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        index = hashed % capacity
+        step = self._step(hashed)
+        free = None
+        for probes in range(1, capacity + 1):
+            state = states[index]
+            if state == _EMPTY:
+                if free is not None:
+                    index = free
+                break
+            if state == _DELETED:
+                if inserting is True and free is None:
+                    free = index
+            elif hashes[index] == hashed and slot_keys[index] == key:
+                break
+            index = (index + step) % capacity
+        else:
+            index = free
+        if self.probe_stats is not None:
+            self.probe_stats.record_probe(key, probes, inserting, index is not None and states[index] == _LIVE)
+        return index
+
+    def _find(self, key: str, hashed: int = None) -> int:
+        """
+        Finds the slot holding key
+        :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: index of the live slot holding key, or None if not found
+        """
+        index = self._hash(key, False, hashed)
+        if index is None or self.states[index] != _LIVE:
+            return None
+        return index
+
+    def _get(self, key: str, hashed: int = None) -> HashNode:
+        """
+        Builds a detached HashNode for key, for callers that expect HashTable._get
+        :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: HashNode copy of the entry with Key, or None if not found
+        """
+        index = self._find(key, hashed)
+        if index is None:
+            return None
+        return HashNode(self.slot_keys[index], self.slot_values[index], False, self.hashes[index])
+
+    def _insert(self, key: str, value: T, hashed: int = None) -> None:
+        """
+        Uses Key Value parameters to add an entry to the table
+        :param key: Key for the entry
+        :param value: Value for the entry
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: None
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        index = self._hash(key, True, hashed)
+        if self.states[index] != _LIVE:
+            self._insert_at(index, key, value, hashed)
+        else:
+            self.slot_values[index] = value
+
+    def _insert_at(self, key_index: int, key: str, value: T, hashed: int) -> None:
+        """
+        Fills the empty slot or tombstone that _hash found for a new key, then grows or compacts the table if needed
+        :param key_index: Index returned by _hash when inserting key
+        :param key: Key for the entry
+        :param value: Value for the entry
+        :param hashed: full hash of key
+        :return: None
+        """
+        if self.states[key_index] == _DELETED:
+            self.tombstones = self.tombstones - 1
+        self.size = self.size + 1
+        self.version = self.version + 1
+        self.states[key_index] = _LIVE
+        self.hashes[key_index] = hashed
+        self.slot_keys[key_index] = key
+        self.slot_values[key_index] = value
+        if self.size >= (self.capacity / 2):
+            self._grow()
+        elif self.tombstones > self.capacity * self.TOMBSTONE_RATIO:
+            self._rehash(self.capacity)
+
+    def get(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key with a single probe sequence
+        :param key: key used to find the value
+        :param default: value returned if key is not in the table
+        :return: value associated with key, or default
+        """
+        index = self._find(key)
+        if index is None:
+            return default
+        return self.slot_values[index]
+
+    def setdefault(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key, inserting default first if key is missing, with a single probe sequence
+        :param key: key used to find the value
+        :param default: value inserted if key is not in the table
+        :return: value associated with key
+        """
+        hashed = _hash_string(key)
+        index = self._hash(key, True, hashed)
+        if self.states[index] != _LIVE:
+            self._insert_at(index, key, default, hashed)
+            return default
+        return self.slot_values[index]
+
+    def pop(self, key: str, default: T = _MISSING) -> T:
+        """
+        Removes key and returns its value, with a single probe sequence
+        :param key: key of the entry to remove
+        :param default: value returned if key is not in the table, KeyError is raised if not given
+        :return: value that was associated with key, or default
+        """
+        index = self._find(key)
+        if index is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self.slot_values[index]
+        self._delete_index(index)
+        return value
+
+    def _increment(self, key: str, delta: T, hashed: int) -> T:
+        """
+        Adds delta to the value of key in place, inserting delta if key is missing
+        :param key: key of the entry to update
+        :param delta: amount added to the value
+        :param hashed: full hash of key
+        :return: new value associated with key
+        """
+        index = self._hash(key, True, hashed)
+        if self.states[index] != _LIVE:
+            self._insert_at(index, key, delta, hashed)
+            return delta
+        self.slot_values[index] += delta
+        return self.slot_values[index]
+
+    def _delete(self, key: str, hashed: int = None) -> None:
+        """
+        Remove the entry with key argument as its key
+        :param key: key of the entry to remove
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: None
+        """
+        index = self._find(key, hashed)
+        if index is not None:
+            self._delete_index(index)
+
+    def _delete_index(self, index: int) -> None:
+        """
+        Turns a live slot into a tombstone, then compacts or shrinks the table as HashTable._delete does
+        :param index: index of a live slot
+        :return: None
+        """
+        self.states[index] = _DELETED
+        self.slot_keys[index] = None
+        self.slot_values[index] = None
+        self.size = self.size - 1
+        self.version = self.version + 1
+        self.tombstones = self.tombstones + 1
+        if self.probe_stats is not None:
+            self.probe_stats.record_delete(self.tombstones)
+        self._shrink()
+
+    def _set_capacity(self, capacity: int) -> None:
+        """
+        Replaces the storage with empty arrays of the given capacity and picks its secondary hash modulus
+        :param capacity: new capacity, a power of two
+        :return: None
+        """
+        self.capacity = capacity
+        self.prime = _prime_at_most(capacity)
+        self.version = self.version + 1
+        self.hashes = array('Q', bytes(8 * capacity))
+        self.states = array('B', bytes(capacity))
+        self.slot_keys = [None] * capacity
+        self.slot_values = [None] * capacity
+
+    def _rehash(self, capacity: int) -> None:
+        """
+        Rebuilds the storage at the given capacity, dropping tombstones and reusing the cached hashes
+        :param capacity: new capacity, a power of two
+        :return: None
+        """
+        old_hashes, old_states = self.hashes, self.states
+        old_keys, old_values = self.slot_keys, self.slot_values
+        self._set_capacity(capacity)
+        self.tombstones = 0
+        hashes, states = self.hashes, self.states
+        slot_keys, slot_values = self.slot_keys, self.slot_values
+        for i in range(len(old_states)):
+            if old_states[i] == _LIVE:
+                hashed = old_hashes[i]
+                index = hashed % capacity
+                step = self._step(hashed)
+                while states[index] != _EMPTY:
+                    index = (index + step) % capacity
+                states[index] = _LIVE
+                hashes[index] = hashed
+                slot_keys[index] = old_keys[i]
+                slot_values[index] = old_values[i]
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Looks up a batch of keys, hashing them all at once before probing
+        :param keys: Iterable of keys to look up
+        :param default: Value returned for keys that are not in the table
+        :return: List of values in the same order as keys
+        """
+        keys = list(keys)
+        if self.probe_stats is not None:
+            # The probe loop below is inlined for speed, so route through _hash while instrumented
+            indices = [self._find(key, hashed) for key, hashed in zip(keys, _hash_strings(keys))]
+            return [default if index is None else self.slot_values[index] for index in indices]
+        states = self.states
+        hashes = self.hashes
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        capacity = self.capacity
+        prime = self.prime
+        results = []
+        for key, hashed in zip(keys, _hash_strings(keys)):
+            index = hashed % capacity
+            step = (prime - hashed % prime) | 1
+            while True:
+                state = states[index]
+                if state == _EMPTY:
+                    results.append(default)
+                    break
+                if state == _LIVE and hashes[index] == hashed and slot_keys[index] == key:
+                    results.append(slot_values[index])
+                    break
+                index = (index + step) % capacity
+        return results
+
+    def _iter_indices(self) -> Iterator[int]:
+        """
+        Yields the indices of the live slots in the table
+        :return: generator of slot indices, raising RuntimeError if the table is resized, or gains or loses keys,
+        while it is being iterated
+        """
+        version = self.version
+        for index, state in enumerate(self.states):
+            if state == _LIVE:
+                yield index
+                if self.version != version:
+                    raise RuntimeError("HashTable changed size during iteration")
+
+    def _iter_keys(self) -> Iterator[str]:
+        """
+        Lazily iterates over the keys in the table
+        :return: generator of keys
+        """
+        slot_keys = self.slot_keys
+        return (slot_keys[index] for index in self._iter_indices())
+
+    def _iter_values(self) -> Iterator[T]:
+        """
+        Lazily iterates over the values in the table
+        :return: generator of values
+        """
+        slot_values = self.slot_values
+        return (slot_values[index] for index in self._iter_indices())
+
+    def _iter_items(self) -> Iterator[Tuple[str, T]]:
+        """
+        Lazily iterates over the key value pairs in the table
+        :return: generator of key value pairs
+        """
+        slot_keys, slot_values = self.slot_keys, self.slot_values
+        return ((slot_keys[index], slot_values[index]) for index in self._iter_indices())
+
+    def _iter_hashed(self) -> Iterator[Tuple[int, str, T]]:
+        """
+        Lazily iterates over the entries in the table along with their cached hashes
+        :return: generator of (hash, key, value) tuples
+        """
+        hashes, slot_keys, slot_values = self.hashes, self.slot_keys, self.slot_values
+        return ((hashes[index], slot_keys[index], slot_values[index]) for index in self._iter_indices())
+
+    def memory_usage(self) -> dict:
+        """
+        Reports the bytes used by the table's storage, not counting the key and value objects themselves
+        :return: dict mapping each storage component to its size in bytes, plus their total
+        """
+        usage = {
+            "hashes": sys.getsizeof(self.hashes),
+            "states": sys.getsizeof(self.states),
+            "keys": sys.getsizeof(self.slot_keys),
+            "values": sys.getsizeof(self.slot_values),
+        }
+        usage["total"] = sum(usage.values())
+        return usage
+
+
+class RobinHoodHashTable(HashTable):
+    """
+    Hash Table with the same API as HashTable that uses Robin Hood hashing over linear probing. Each insert may
+    displace an entry that sits closer to its home slot, so entries stay sorted by displacement along a run and a
+    miss stops as soon as its own distance exceeds the displacement of the slot it reaches. Deletion shifts the
+    following entries back, so no tombstones are left and the table can safely run at MAX_LOAD
+    """
+    __slots__ = ['shift']
+
+    # Load factor at which the table grows
+    MAX_LOAD = 0.875
+
+    def __eq__(self, other: HashTable) -> bool:
+        """
+        Equality operator. Tables of other storage engines lay out their slots differently, so they are compared
+        by their entries
+        :param other: other hash table we are comparing with this one
+        :return: bool if equal or not
+        """
+        if not isinstance(other, RobinHoodHashTable):
+            return self._same_entries(other)
+        return super().__eq__(other)
+
+    def _set_capacity(self, capacity: int) -> None:
+        """
+        Replaces the table with an empty one of the given capacity
+        :param capacity: new capacity, a power of two
+        :return: None
+        """
+        super()._set_capacity(capacity)
+        self.shift = 65 - capacity.bit_length()
+
+    def _home(self, hashed: int) -> int:
+        """
+        Finds the home slot of a hash by Fibonacci hashing, taking the high bits so every bit of the hash counts
+        :param hashed: full hash of a key
+        :return: index of the slot the key's probe sequence starts at
+        """
+        return ((hashed * _FIBONACCI) & _HASH_MASK) >> self.shift
+
+    def _hash(self, key: str, inserting: bool = False, hashed: int = None) -> int:
+        """
+        Searches for the index of a key in the hash table, stopping early once the key would have displaced
+        the entry being examined
+        :param key: Key being searched for
+        :param inserting: unused, kept for compatibility with HashTable._hash
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: Index of key, or None if it is not in the table
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        table = self.table
+        mask = self.capacity - 1
+        shift = self.shift
+        index = ((hashed * _FIBONACCI) & _HASH_MASK) >> shift
+        distance = 0
+        while True:
+            node = table[index]
+            if node is None or (index - (((node.hash * _FIBONACCI) & _HASH_MASK) >> shift)) & mask < distance:
+                index = None
+                break
+            if node.hash == hashed and node.key == key:
+                break
+            index = (index + 1) & mask
+            distance += 1
+        if self.probe_stats is not None:
+            self.probe_stats.record_probe(key, distance + 1, inserting, index is not None)
+        return index
+
+    def _insert(self, key: str, value: T, hashed: int = None) -> None:
+        """
+        Uses Key Value parameters to add a HashNode to the HashTable in a single pass, updating the key if it is
+        found before the first entry it would displace
+        :param key: Key for HashNode
+        :param value: Value for Hashnode
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: None
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        table = self.table
+        mask = self.capacity - 1
+        shift = self.shift
+        index = ((hashed * _FIBONACCI) & _HASH_MASK) >> shift
+        distance = 0
+        while True:
+            node = table[index]
+            if node is None:
+                break
+            if node.hash == hashed and node.key == key:
+                node.value = value
+                if self.probe_stats is not None:
+                    self.probe_stats.record_probe(key, distance + 1, True, True)
+                return
+            if (index - (((node.hash * _FIBONACCI) & _HASH_MASK) >> shift)) & mask < distance:
+                break
+            index = (index + 1) & mask
+            distance += 1
+        if self.probe_stats is not None:
+            self.probe_stats.record_probe(key, distance + 1, True, False)
+        self._place_at(HashNode(key, value, False, hashed), index, distance)
+        self.size = self.size + 1
+        self.version = self.version + 1
+        if self.size >= self.capacity * self.MAX_LOAD:
+            self._grow()
+
+    def _place(self, node: HashNode) -> None:
+        """
+        Puts a node that is not yet in the table into its Robin Hood position using its cached hash
+        :param node: HashNode to place
+        :return: None
+        """
+        self._place_at(node, self._home(node.hash), 0)
+
+    def _place_at(self, node: HashNode, index: int, distance: int) -> None:
+        """
+        Continues placing a node from a point along its probe sequence, swapping it with every entry that sits
+        closer to its own home and carrying the displaced entry onwards until an empty slot is reached
+        :param node: HashNode to place
+        :param index: slot to continue from
+        :param distance: distance of index from the node's home slot
+        :return: None
+        """
+        table = self.table
+        mask = self.capacity - 1
+        shift = self.shift
+        while True:
+            current = table[index]
+            if current is None:
+                table[index] = node
+                return
+            current_distance = (index - (((current.hash * _FIBONACCI) & _HASH_MASK) >> shift)) & mask
+            if current_distance < distance:
+                table[index] = node
+                node = current
+                distance = current_distance
+            index = (index + 1) & mask
+            distance += 1
+
+    def _delete(self, key: str, hashed: int = None) -> None:
+        """
+        Remove HashNode with key argument as its key, shifting the entries after it back one slot
+        :param key: key of HashNode to remove
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: None
+        """
+        index = self._hash(key, False, hashed)
+        if index is not None:
+            self._remove_at(index)
+
+    def _remove(self, node: HashNode) -> None:
+        """
+        Removes a live node, shifting the entries after it back one slot
+        :param node: live HashNode in this table
+        :return: None
+        """
+        self._remove_at(self._hash(node.key, False, node.hash))
+
+    def _remove_at(self, index: int) -> None:
+        """
+        Empties a slot by backward-shift deletion: each following entry that is not in its home slot moves back
+        by one, which keeps every probe run contiguous without tombstones
+        :param index: index of a live slot
+        :return: None
+        """
+        table = self.table
+        mask = self.capacity - 1
+        shift = self.shift
+        node = table[index]
+        following = (index + 1) & mask
+        while True:
+            current = table[following]
+            if current is None or (((current.hash * _FIBONACCI) & _HASH_MASK) >> shift) == following:
+                break
+            table[index] = current
+            index = following
+            following = (following + 1) & mask
+        table[index] = None
+        node.key = None
+        node.value = None
+        node.deleted = True
+        self.size = self.size - 1
+        self.version = self.version + 1
+        if self.probe_stats is not None:
+            self.probe_stats.record_delete(self.tombstones)
+        self._shrink()
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes the entry associated with key argument
+        :param key: key used to indicate entry for deletion
+        :return: None
+        """
+        index = self._hash(key)
+        if index is None:
+            raise KeyError(key)
+        self._remove_at(index)
+
+    def setdefault(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key, inserting default first if key is missing. A missing key is probed again to insert
+        it, since a Robin Hood insert may move the entries it passes
+        :param key: key used to find the value
+        :param default: value inserted if key is not in the table
+        :return: value associated with key
+        """
+        node = self._find_or_insert(key, default, _hash_string(key))
+        if node is None:
+            return default
+        return node.value
+
+    def pop(self, key: str, default: T = _MISSING) -> T:
+        """
+        Removes key and returns its value, with a single probe sequence
+        :param key: key of the entry to remove
+        :param default: value returned if key is not in the table, KeyError is raised if not given
+        :return: value that was associated with key, or default
+        """
+        index = self._hash(key)
+        if index is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self.table[index].value
+        self._remove_at(index)
+        return value
+
+    def _increment(self, key: str, delta: T, hashed: int) -> T:
+        """
+        Adds delta to the value of key in place, inserting delta if key is missing
+        :param key: key of the entry to update
+        :param delta: amount added to the value
+        :param hashed: full hash of key
+        :return: new value associated with key
+        """
+        node = self._find_or_insert(key, delta, hashed)
+        if node is None:
+            return delta
+        node.value += delta
+        return node.value
+
+    def _reserve(self, count: int) -> None:
+        """
+        Resizes the table once so that it can hold count entries without growing, and keeps deletions from
+        shrinking it below that size
+        :param count: Number of entries the table must hold
+        :return: None
+        """
+        if count >= self.capacity * self.MAX_LOAD:
+            self._rehash(max(_round_capacity(int(count / self.MAX_LOAD) + 1), self.MIN_CAPACITY))
+            self.reserved = max(self.reserved, self.capacity)
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Looks up a batch of keys, hashing them all at once before probing
+        :param keys: Iterable of keys to look up
+        :param default: Value returned for keys that are not in the table
+        :return: List of values in the same order as keys
+        """
+        keys = list(keys)
+        results = []
+        table = self.table
+        for key, hashed in zip(keys, _hash_strings(keys)):
+            index = self._hash(key, False, hashed)
+            results.append(default if index is None else table[index].value)
+        return results
+
+
+class IncrementalHashTable(HashTable):
+    """
+    Hash Table with the same API as HashTable that grows incrementally. Doubling the capacity allocates the new
+    table but keeps the old one alongside it, and every later insert or deletion moves the next MIGRATE_BUCKETS
+    slots of the old table across, so no single insert pays for rehashing every entry. Lookups consult both
+    tables until the old one is empty. Compacting tombstones and shrinking still rebuild the table at once.
+    The worst case insert is still O(capacity), only with a much smaller constant: the insert that starts a grow
+    allocates the doubled slot list, and the one that finishes it frees the old list. Both run in C at a few
+    nanoseconds per slot, around 10 ms at four million slots, against seconds for a full rehash. Allocating the
+    new list in steps does not remove this, because growing a list by extend reallocates and copies it
+    """
+    __slots__ = ['old_table', 'old_capacity', 'old_prime', 'migrated']
+
+    # Old slots moved to the new table on each insert or deletion while a grow is in progress. At least two per
+    # insert are needed to empty the old table before the new one fills up and has to grow again
+    MIGRATE_BUCKETS = 16
+
+    # Left in old slots whose node has moved, so probe sequences through them still continue
+    _MOVED = HashNode(None, None, True)
+
+    def __init__(self, capacity: int = 8) -> None:
+        """
+        Initializes hash table
+        :param capacity: capacity of the hash table, rounded up to a power of two
+        """
+        self.old_table = None
+        self.old_capacity = 0
+        self.old_prime = 0
+        self.migrated = 0
+        super().__init__(capacity)
+
+    def __eq__(self, other: HashTable) -> bool:
+        """
+        Equality operator. Slots are compared only with plain and incremental tables that are not growing;
+        otherwise the entries are compared, without moving any
+        :param other: other hash table we are comparing with this one
+        :return: bool if equal or not
+        """
+        if (type(other) in (HashTable, IncrementalHashTable) and self.old_table is None
+                and getattr(other, "old_table", None) is None):
+            return super().__eq__(other)
+        return self._same_entries(other)
+
+    def __str__(self) -> str:
+        """
+        Represents the table as a string, followed by the old table while a grow is in progress
+        :return: string representation of the hash table
+        """
+        represent = super().__str__()
+        if self.old_table is not None:
+            for bin_no, item in enumerate(self.old_table):
+                represent += "[old " + str(bin_no) + "]: " + str(item) + '\n'
+        return represent
+
+    __repr__ = __str__
+
+    def _find_old(self, key: str, hashed: int) -> int:
+        """
+        Searches the old table for a key that has not been moved yet
+        :param key: Key being searched for
+        :param hashed: full hash of key
+        :return: Index of key in the old table, or None if it is not there
+        """
+        table = self.old_table
+        capacity = self.old_capacity
+        prime = self.old_prime
+        index = hashed % capacity
+        step = (prime - hashed % prime) | 1
+        for _ in range(capacity):
+            node = table[index]
+            if node is None:
+                return None
+            if node.hash == hashed and node.key == key and node.deleted is False:
+                return index
+            index = (index + step) % capacity
+        return None
+
+    def _get(self, key: str, hashed: int = None) -> HashNode:
+        """
+        Find HashNode with key argument as its key, in the new table and then the old one
+        :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: HashNode with Key, or None if not found
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        node = super()._get(key, hashed)
+        if node is None and self.old_table is not None:
+            index = self._find_old(key, hashed)
+            if index is not None:
+                return self.old_table[index]
+        return node
+
+    def _insert(self, key: str, value: T, hashed: int = None) -> None:
+        """
+        Uses Key Value parameters to add a HashNode to the HashTable, updating the key in place if it is still
+        in the old table
+        :param key: Key for HashNode
+        :param value: Value for Hashnode
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: None
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        if self.old_table is not None:
+            index = self._find_old(key, hashed)
+            if index is not None:
+                self.old_table[index].value = value
+                return
+        super()._insert(key, value, hashed)
+
+    def _insert_at(self, key_index: int, key: str, value: T, hashed: int) -> None:
+        """
+        Adds a new HashNode at the slot that _hash found for it, grows or compacts the table if needed, then moves
+        the next slots of the old table across
+        :param key_index: Index returned by _hash when inserting key
+        :param key: Key for HashNode
+        :param value: Value for HashNode
+        :param hashed: full hash of key
+        :return: None
+        """
+        super()._insert_at(key_index, key, value, hashed)
+        if self.old_table is not None:
+            self._migrate(self.MIGRATE_BUCKETS)
+
+    def setdefault(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key, inserting default first if key is missing
+        :param key: key used to find the value
+        :param default: value inserted if key is not in the table
+        :return: value associated with key
+        """
+        node = self._find_or_insert(key, default, _hash_string(key))
+        if node is None:
+            return default
+        return node.value
+
+    def _increment(self, key: str, delta: T, hashed: int) -> T:
+        """
+        Adds delta to the value of key in place, inserting delta if key is missing
+        :param key: key of the entry to update
+        :param delta: amount added to the value
+        :param hashed: full hash of key
+        :return: new value associated with key
+        """
+        node = self._find_or_insert(key, delta, hashed)
+        if node is None:
+            return delta
+        node.value += delta
+        return node.value
+
+    def _remove(self, node: HashNode) -> None:
+        """
+        Turns a live node into a tombstone, then compacts or shrinks the table if needed and moves the next slots
+        of the old table across. Tombstones left in the old table are dropped with it, so they are not counted
+        :param node: live HashNode in this table
+        :return: None
+        """
+        if self.old_table is None or self._find_old(node.key, node.hash) is None:
+            super()._remove(node)
+        else:
+            node.key = None
+            node.value = None
+            node.deleted = True
+            self.size = self.size - 1
+            self.version = self.version + 1
+            if self.probe_stats is not None:
+                self.probe_stats.record_delete(self.tombstones)
+            self._shrink()
+        if self.old_table is not None:
+            self._migrate(self.MIGRATE_BUCKETS)
+
+    def _migrate(self, buckets: int) -> None:
+        """
+        Moves the live nodes of the next slots of the old table into the new one, and drops the old table once
+        every slot has been moved
+        :param buckets: number of old slots to move
+        :return: None
+        """
+        old_table = self.old_table
+        moved = self._MOVED
+        end = min(self.migrated + buckets, self.old_capacity)
+        for index in range(self.migrated, end):
+            node = old_table[index]
+            if node is not None and node.deleted is False:
+                old_table[index] = moved
+                self._place(node)
+        self.migrated = end
+        if end == self.old_capacity:
+            self.old_table = None
+
+    def _finish_migration(self) -> None:
+        """
+        Moves everything left in the old table at once, invalidating any iterators over the table
+        :return: None
+        """
+        if self.old_table is not None:
+            self._migrate(self.old_capacity)
+            self.version = self.version + 1
+
+    def _grow(self) -> None:
+        """
+        Starts doubling the capacity of the Hash Table, replacing the table with an empty one and keeping the old
+        one to be moved across by later operations
+        :param: None
+        :return: None
+        """
+        self._finish_migration()
+        start = time.perf_counter()
+        self.old_table = self.table
+        self.old_capacity = self.capacity
+        self.old_prime = self.prime
+        self.migrated = 0
+        self._set_capacity(self.capacity * 2)
+        self.tombstones = 0
+        if self.probe_stats is not None:
+            self.probe_stats.record_grow(self.capacity, time.perf_counter() - start)
+
+    def _rehash(self, capacity: int) -> None:
+        """
+        Rebuilds the table at the given capacity, finishing any grow in progress first
+        :param capacity: new capacity, a power of two
+        :return: None
+        """
+        self._finish_migration()
+        super()._rehash(capacity)
+
+    def _iter_nodes(self) -> Iterator[HashNode]:
+        """
+        Yields the live nodes of the old table and then of the new one
+        :return: generator of HashNodes, raising RuntimeError if the table is resized, or gains or loses keys,
+        while it is being iterated
+        """
+        version = self.version
+        tables = (self.table,) if self.old_table is None else (self.old_table, self.table)
+        for table in tables:
+            for node in table:
+                if node is not None and node.deleted is False:
+                    yield node
+                    if self.version != version:
+                        raise RuntimeError("HashTable changed size during iteration")
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Looks up a batch of keys, hashing them all at once before probing
+        :param keys: Iterable of keys to look up
+        :param default: Value returned for keys that are not in the table
+        :return: List of values in the same order as keys
+        """
+        if self.old_table is None:
+            return super().get_many(keys, default)
+        keys = list(keys)
+        nodes = [self._get(key, hashed) for key, hashed in zip(keys, _hash_strings(keys))]
+        return [default if node is None else node.value for node in nodes]
+
+    def clear(self, shrink: bool = False) -> None:
+        """
+        Resets the nodes in the HashTable to None, abandoning any grow in progress
+        :param shrink: bool indicating whether to release memory by shrinking the table to MIN_CAPACITY
+        :return: None
+        """
+        self.old_table = None
+        super().clear(shrink)
+
+    def stats(self) -> dict:
+        """
+        Reports the table's load, the old slots still to be moved, plus the collected probe and resize statistics
+        if enable_stats was called
+        :return: dict of statistics
+        """
+        report = super().stats()
+        report["pending_buckets"] = 0 if self.old_table is None else self.old_capacity - self.migrated
+        return report
+
+    def memory_usage(self) -> dict:
+        """
+        Reports the bytes used by the table's storage, including the old table while a grow is in progress, not
+        counting the key and value objects themselves
+        :return: dict mapping each storage component to its size in bytes, plus their total
+        """
+        usage = super().memory_usage()
+        del usage["total"]
+        if self.old_table is not None:
+            usage["old_slots"] = sys.getsizeof(self.old_table)
+            for node in self.old_table:
+                if node is not None and node is not self._MOVED:
+                    usage["nodes"] += sys.getsizeof(node)
+        usage["total"] = sum(usage.values())
+        return usage
+
+
+class FrozenHashTable(HashTable):
+    """
+    Read-only Hash Table that serves lookups straight from a snapshot in any buffer, such as a memory-mapped file,
+    without building nodes or rehashing keys. Values are unpickled each time they are read
+    """
+    __slots__ = ['buffer', 'slots', 'mapped', 'file']
+
+    def __init__(self, buffer: Union[bytes, memoryview, mmap.mmap]) -> None:
+        """
+        Initializes the table over a snapshot
+        :param buffer: Buffer holding a snapshot written by HashTable.save
+        """
+        buffer = memoryview(buffer)
+        magic, capacity, prime, size = _SNAPSHOT_HEADER.unpack_from(buffer)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("buffer does not hold a HashTable snapshot")
+        end = _SNAPSHOT_HEADER.size + 8 * _SNAPSHOT_SLOT_WIDTH * capacity
+        slots = buffer[_SNAPSHOT_HEADER.size:end]
+        if sys.byteorder == "little":
+            slots = slots.cast("Q")
+        else:
+            slots = array("Q", slots)
+            slots.byteswap()
+        self.buffer = buffer
+        self.slots = slots
+        self.capacity = capacity
+        self.prime = prime
+        self.size = size
+        self.tombstones = 0
+        self.version = 0
+        self.probe_stats = None
+        self.reserved = capacity
+        self.mapped = None
+        self.file = None
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike]) -> FrozenHashTable:
+        """
+        Memory-maps a snapshot file and serves lookups from it
+        :param path: Path of the snapshot file
+        :return: Table over the mapped file, which stays open until close is called
+        """
+        file = open(path, "rb")
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            file.close()
+            raise
+        table = cls(mapped)
+        table.mapped = mapped
+        table.file = file
+        return table
+
+    def close(self) -> None:
+        """
+        Releases the buffer, and the mapped file if the table was opened from one
+        :return: None
+        """
+        if isinstance(self.slots, memoryview):
+            self.slots.release()
+        self.buffer.release()
+        if self.mapped is not None:
+            self.mapped.close()
+            self.file.close()
+            self.mapped = None
+            self.file = None
+
+    def __enter__(self) -> FrozenHashTable:
+        """
+        Uses the table as a context manager that closes it on exit
+        :return: this table
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Closes the table
+        :return: None
+        """
+        self.close()
+
+    def __eq__(self, other: HashTable) -> bool:
+        """
+        Equality operator
+        :param other: other hash table we are comparing with this one
+        :return: bool if equal or not
+        """
+        if self.capacity != other.capacity or self.size != other.size:
+            return False
+        return list(self.items()) == list(other.items())
+
+    def __str__(self) -> str:
+        """
+        Represents the table as a string
+        :return: string representation of the hash table
+        """
+        lines = []
+        for i in range(self.capacity):
+            item = None
+            if self.slots[_SNAPSHOT_SLOT_WIDTH * i + 1] != 0:
+                item = HashNode(self._key_at(i), self._value_at(i), False, self.slots[_SNAPSHOT_SLOT_WIDTH * i])
+            lines.append("[" + str(i) + "]: " + str(item) + '\n')
+        return "".join(lines)
+
+    __repr__ = __str__
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Gets value from key if it exists, otherwise raises KeyError
+        :param key: key used to find the value
+        :return: value associated with key
+        """
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        return self._value_at(index)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Determines if an entry with the key denoted by the parameter exists
+        :param key: Key being checked for in table
+        :return: Bool indicating whether the key was found
+        """
+        return self._find(key) is not None
+
+    def _find(self, key: str, hashed: int = None) -> int:
+        """
+        Finds the slot holding key
+        :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: index of the slot holding key, or None if not found
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        slots = self.slots
+        buffer = self.buffer
+        capacity = self.capacity
+        index = hashed % capacity
+        step = self._step(hashed)
+        encoded = None
+        while True:
+            record = _SNAPSHOT_SLOT_WIDTH * index
+            key_start = slots[record + 1]
+            if key_start == 0:
+                return None
+            if slots[record] == hashed:
+                if encoded is None:
+                    encoded = key.encode("utf-8", "surrogatepass")
+                if buffer[key_start:slots[record + 2]] == encoded:
+                    return index
+            index = (index + step) % capacity
+
+    def _key_at(self, index: int) -> str:
+        """
+        Decodes the key stored in a slot
+        :param index: index of a full slot
+        :return: key of the slot
+        """
+        record = _SNAPSHOT_SLOT_WIDTH * index
+        return str(self.buffer[self.slots[record + 1]:self.slots[record + 2]], "utf-8", "surrogatepass")
+
+    def _value_at(self, index: int) -> T:
+        """
+        Unpickles the value stored in a slot
+        :param index: index of a full slot
+        :return: value of the slot
+        """
+        record = _SNAPSHOT_SLOT_WIDTH * index
+        return pickle.loads(self.buffer[self.slots[record + 2]:self.slots[record + 3]])
+
+    def _get(self, key: str, hashed: int = None) -> HashNode:
+        """
+        Builds a detached HashNode for key, for callers that expect HashTable._get
+        :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: HashNode copy of the entry with Key, or None if not found
+        """
+        index = self._find(key, hashed)
+        if index is None:
+            return None
+        return HashNode(key, self._value_at(index), False, self.slots[_SNAPSHOT_SLOT_WIDTH * index])
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Looks up a batch of keys, hashing them all at once before probing
+        :param keys: Iterable of keys to look up
+        :param default: Value returned for keys that are not in the table
+        :return: List of values in the same order as keys
+        """
+        keys = list(keys)
+        results = []
+        for key, hashed in zip(keys, _hash_strings(keys)):
+            index = self._find(key, hashed)
+            results.append(default if index is None else self._value_at(index))
+        return results
+
+    def _read_only(self, *args, **kwargs) -> None:
+        """
+        Rejects any change to the table
+        :return: None
+        """
+        raise TypeError("FrozenHashTable is read-only")
+
+    __delitem__ = _insert = _insert_at = _delete = _rehash = _set_capacity = clear = _read_only
+    setdefault = pop = _increment = _read_only
+
+    def _iter_indices(self) -> Iterator[int]:
+        """
+        Yields the indices of the full slots in the table
+        :return: generator of slot indices
+        """
+        slots = self.slots
+        for index in range(self.capacity):
+            if slots[_SNAPSHOT_SLOT_WIDTH * index + 1] != 0:
+                yield index
+
+    def _iter_keys(self) -> Iterator[str]:
+        """
+        Lazily iterates over the keys in the table
+        :return: generator of keys
+        """
+        return (self._key_at(index) for index in self._iter_indices())
+
+    def _iter_values(self) -> Iterator[T]:
+        """
+        Lazily iterates over the values in the table
+        :return: generator of values
+        """
+        return (self._value_at(index) for index in self._iter_indices())
+
+    def _iter_items(self) -> Iterator[Tuple[str, T]]:
+        """
+        Lazily iterates over the key value pairs in the table
+        :return: generator of key value pairs
+        """
+        return ((self._key_at(index), self._value_at(index)) for index in self._iter_indices())
+
+    def _iter_hashed(self) -> Iterator[Tuple[int, str, T]]:
+        """
+        Lazily iterates over the entries in the table along with their cached hashes
+        :return: generator of (hash, key, value) tuples
+        """
+        return ((self.slots[_SNAPSHOT_SLOT_WIDTH * index], self._key_at(index), self._value_at(index))
+                for index in self._iter_indices())
+
+    def memory_usage(self) -> dict:
+        """
+        Reports the bytes of the snapshot the table is served from
+        :return: dict mapping each storage component to its size in bytes, plus their total
+        """
+        usage = {"snapshot": self.buffer.nbytes}
+        usage["total"] = usage["snapshot"]
+        return usage
+
+
+def _snapshot_layout(table: HashTable) -> Tuple[array, List[bytes]]:
+    """
+    Lays out the live entries of a table in the snapshot format, placing each one along its double hashing probe
+    sequence at the table's capacity, so the snapshot holds no tombstones
+    :param table: Table to lay out
+    :return: Slot records as a little-endian array, and the encoded keys and values in file order
+    """
+    capacity = table.capacity
+    slots = array("Q", bytes(8 * _SNAPSHOT_SLOT_WIDTH * capacity))
+    blobs = []
+    offset = _SNAPSHOT_HEADER.size + 8 * _SNAPSHOT_SLOT_WIDTH * capacity
+    for hashed, key, value in table._iter_hashed():
+        index = hashed % capacity
+        step = table._step(hashed)
+        while slots[_SNAPSHOT_SLOT_WIDTH * index + 1] != 0:
+            index = (index + step) % capacity
+        encoded_key = key.encode("utf-8", "surrogatepass")
+        encoded_value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        record = _SNAPSHOT_SLOT_WIDTH * index
+        slots[record] = hashed
+        slots[record + 1] = offset
+        slots[record + 2] = offset + len(encoded_key)
+        slots[record + 3] = offset + len(encoded_key) + len(encoded_value)
+        offset = slots[record + 3]
+        blobs.append(encoded_key)
+        blobs.append(encoded_value)
+    if sys.byteorder != "little":
+        slots.byteswap()
+    return slots, blobs
+
+
+class SharedHashTable(FrozenHashTable):
+    """
+    Read-only Hash Table held in a multiprocessing shared memory block in the snapshot format, so one process can
+    build it and any number of worker processes can attach by name and look keys up without copying it. Pickling
+    a SharedHashTable only sends its name, so it can be passed to pool workers directly
+    """
+    __slots__ = ['shm', 'owner']
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False) -> None:
+        """
+        Initializes the table over a shared memory block holding a snapshot
+        :param shm: shared memory block
+        :param owner: bool indicating if this process created the block and is responsible for unlinking it
+        """
+        super().__init__(shm.buf)
+        self.shm = shm
+        self.owner = owner
+
+    @classmethod
+    def create(cls, table: Union[HashTable, Iterable[Tuple[str, T]]], name: str = None) -> SharedHashTable:
+        """
+        Copies a table, or key value pairs, into a new shared memory block
+        :param table: HashTable of any storage engine, or an iterable of key value tuples
+        :param name: name for the shared memory block, chosen by the system if None
+        :return: Table over the new block, owned by this process
+        """
+        if not isinstance(table, HashTable):
+            table = HashTable.from_items(table)
+        slots, blobs = _snapshot_layout(table)
+        header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, table.capacity, table.prime, table.size)
+        slot_bytes = memoryview(slots).cast("B")
+        size = len(header) + len(slot_bytes) + sum(len(blob) for blob in blobs)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buffer = shm.buf
+        buffer[:len(header)] = header
+        offset = len(header)
+        buffer[offset:offset + len(slot_bytes)] = slot_bytes
+        offset += len(slot_bytes)
+        for blob in blobs:
+            buffer[offset:offset + len(blob)] = blob
+            offset += len(blob)
+        slot_bytes.release()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, inherited_tracker: bool = False) -> SharedHashTable:
+        """
+        Attaches to a shared memory block created by another process
+        :param name: name of the shared memory block
+        :param inherited_tracker: bool indicating if this process was started by multiprocessing from the creating
+        process, and so shares its resource tracker. Unpickled tables pass True
+        :return: Table over the block, which this process must close but not unlink
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching registers the block with the resource tracker, which unlinks it when the
+            # tracker exits. A tracker inherited from the creator already holds the block, so registering again is
+            # a no-op and unregistering would drop the creator's entry; any other tracker must forget the block
+            shm = shared_memory.SharedMemory(name=name)
+            if not inherited_tracker:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        """
+        Name other processes attach to
+        :return: name of the shared memory block
+        """
+        return self.shm.name
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles the table as its name, so receiving processes attach instead of copying. Meant for passing the
+        table to processes started by multiprocessing, which share the creator's resource tracker
+        :return: reconstruction instructions for pickle
+        """
+        return SharedHashTable.attach, (self.name, True)
+
+    def close(self) -> None:
+        """
+        Detaches this process from the shared memory block, leaving it available to others
+        :return: None
+        """
+        super().close()
+        self.shm.close()
+
+    def __del__(self) -> None:
+        """
+        Detaches this process when the table is garbage collected without being closed, releasing the views of
+        the block before the block itself is closed
+        :return: None
+        """
+        try:
+            self.shm
+        except AttributeError:
+            return
+        self.close()
+
+    def unlink(self) -> None:
+        """
+        Detaches and frees the shared memory block, once every worker is done with the table. A block that has
+        already been freed is ignored
+        :return: None
+        :raises RuntimeError: if this process attached to the block instead of creating it
+        """
+        if not self.owner:
+            raise RuntimeError("only the process that created a SharedHashTable can unlink it")
+        self.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ConcurrentHashTable:
+    """
+    Thread-safe Hash Table that partitions keys across independent HashTable shards, each guarded by its own lock,
+    so threads working on different shards never wait on each other and a grow only blocks its own shard. On a
+    build of Python with the GIL, threads still run one at a time, so throughput matches a single global lock;
+    sharding only keeps a long grow from blocking the other shards
+    """
+    __slots__ = ['shards', 'locks']
+
+    def __init__(self, shards: int = 16, capacity: int = 8, table_class: type = HashTable) -> None:
+        """
+        Initializes the sharded table
+        :param shards: number of shards
+        :param capacity: initial capacity of each shard
+        :param table_class: HashTable class each shard is built from
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.shards = [table_class(capacity) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard(self, hashed: int) -> int:
+        """
+        Picks the shard for a key. The hash is mixed by Fibonacci hashing and its high bits are used, because each
+        shard picks its slots from the low bits and short keys have no high bits of their own
+        :param hashed: full hash of the key
+        :return: index of the shard holding the key
+        """
+        return (((hashed * _FIBONACCI) & _HASH_MASK) >> 32) % len(self.shards)
+
+    def __len__(self) -> int:
+        """
+        Finds number of entries across all shards
+        :return: number of entries in the table
+        """
+        return sum(len(shard) for shard in self.shards)
+
+    def __setitem__(self, key: str, value: T) -> None:
+        """
+        Inserts or updates key in its shard
+        :param key: key for new / updated entry
+        :param value: value for new / updated entry
+        :return: None
+        """
+        hashed = _hash_string(key)
+        i = self._shard(hashed)
+        with self.locks[i]:
+            self.shards[i]._insert(key, value, hashed)
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Gets value from key if it exists, otherwise raises KeyError
+        :param key: key used to find the value
+        :return: value associated with key
+        """
+        hashed = _hash_string(key)
+        i = self._shard(hashed)
+        with self.locks[i]:
+            node = self.shards[i]._get(key, hashed)
+            if node is None:
+                raise KeyError(key)
+            return node.value
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes the entry associated with key argument
+        :param key: key used to indicate entry for deletion
+        :return: None
+        """
+        hashed = _hash_string(key)
+        i = self._shard(hashed)
+        with self.locks[i]:
+            shard = self.shards[i]
+            size = shard.size
+            shard._delete(key, hashed)
+            if shard.size == size:
+                raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Determines if an entry with the key denoted by the parameter exists
+        :param key: Key being checked for in table
+        :return: Bool indicating whether the key was found
+        """
+        hashed = _hash_string(key)
+        i = self._shard(hashed)
+        with self.locks[i]:
+            return self.shards[i]._get(key, hashed) is not None
+
+    def update(self, pairs: Iterable[Tuple[str, T]] = None) -> None:
+        """
+        Updates the table using an iterable of key value pairs, taking each shard's lock once per batch
+        :param pairs: An iterable of tuples holding key value pairs
+        :return: None
+        """
+        if pairs is None:
+            return
+        iterator = iter(pairs)
+        while True:
+            chunk = list(islice(iterator, _VECTORIZE_CHUNK))
+            if not chunk:
+                break
+            batches = [[] for _ in self.shards]
+            for (key, value), hashed in zip(chunk, _hash_strings([pair[0] for pair in chunk])):
+                batches[self._shard(hashed)].append((key, value, hashed))
+            for i, batch in enumerate(batches):
+                if batch:
+                    with self.locks[i]:
+                        shard = self.shards[i]
+                        for key, value, hashed in batch:
+                            shard._insert(key, value, hashed)
+
+    def keys(self) -> List[str]:
+        """
+        Makes a list of all keys, copying one shard at a time under its lock
+        :return: list of keys
+        """
+        keys = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                keys.extend(shard.keys())
+        return keys
+
+    def values(self) -> List[T]:
+        """
+        Makes a list of all values, copying one shard at a time under its lock
+        :return: list of values
+        """
+        values = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                values.extend(shard.values())
+        return values
+
+    def items(self) -> List[Tuple[str, T]]:
+        """
+        Makes a list of all key value pairs, copying one shard at a time under its lock
+        :return: List of key value pairs
+        """
+        pairs = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                pairs.extend(shard.items())
+        return pairs
+
+    def clear(self, shrink: bool = False) -> None:
+        """
+        Clears every shard
+        :param shrink: bool indicating whether to release memory by shrinking each shard to its MIN_CAPACITY
+        :return: None
+        """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.clear(shrink)
+
+
+class CacheTable(HashTable):
+    """
+    Bounded cache built on HashTable. Entries are evicted least recently used first once the table holds more than
+    max_entries entries or max_bytes bytes, and may expire after a time to live. Recency is kept in O(1) by an
+    intrusive doubly linked list threaded through the CacheNodes in the table's slots
+    """
+    __slots__ = ['max_entries', 'max_bytes', 'ttl', 'sizeof', 'nbytes', 'head', 'hits', 'misses', 'evictions',
+                 'expirations']
+
+    def __init__(self, capacity: int = 8, max_entries: int = None, max_bytes: int = None, ttl: float = None,
+                 sizeof: Callable[[str, T], int] = None) -> None:
+        """
+        Initializes the cache
+        :param capacity: initial capacity of the hash table, rounded up to a power of two
+        :param max_entries: maximum number of entries, or None for no limit
+        :param max_bytes: maximum total size of the entries as measured by sizeof, or None for no limit
+        :param ttl: default number of seconds an entry lives for, or None for no expiry
+        :param sizeof: callable measuring the bytes of a key and value, sys.getsizeof of both by default
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof if sizeof is not None else _entry_size
+        self.head = CacheNode(None, None)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        super().__init__(capacity)
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Gets value from key if it is cached and not expired, otherwise raises KeyError. Marks the entry as the
+        most recently used
+        :param key: key used to find the value
+        :return: value associated with key
+        """
+        node = self._lookup(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Determines if key is cached and not expired, without changing its recency or the hit counters
+        :param key: Key being checked for in table
+        :return: Bool indicating whether the key was found
+        """
+        node = self._get(key)
+        if node is None:
+            return False
+        if node.expires is not None and node.expires <= time.monotonic():
+            self._expire(node)
+            return False
+        return True
+
+    def _lookup(self, key: str, hashed: int = None) -> CacheNode:
+        """
+        Finds a live, unexpired node, counting a hit or miss and marking a hit as the most recently used
+        :param key: Key to search for
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :return: CacheNode with Key, or None if not found
+        """
+        node = self._get(key, hashed)
+        if node is not None and node.expires is not None and node.expires <= time.monotonic():
+            self._expire(node)
+            node = None
+        if node is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._unlink(node)
+        self._link(node)
+        return node
+
+    def get_or_compute(self, key: str, fn: Callable[[str], T], ttl: float = None) -> T:
+        """
+        Returns the cached value for key, computing and caching it on a miss
+        :param key: key of the entry
+        :param fn: callable computing the value, called with key
+        :param ttl: seconds the computed entry lives for, the table's default ttl if None
+        :return: cached or computed value
+        """
+        hashed = _hash_string(key)
+        node = self._lookup(key, hashed)
+        if node is not None:
+            return node.value
+        value = fn(key)
+        self._insert(key, value, hashed, ttl)
+        return value
+
+    def set(self, key: str, value: T, ttl: float = None) -> None:
+        """
+        Caches a value with its own time to live
+        :param key: key for new / updated entry
+        :param value: value for new / updated entry
+        :param ttl: seconds the entry lives for, the table's default ttl if None
+        :return: None
+        """
+        self._insert(key, value, None, ttl)
+
+    def get(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key if it is cached and not expired, marking it as the most recently used
+        :param key: key used to find the value
+        :param default: value returned on a miss
+        :return: value associated with key, or default
+        """
+        node = self._lookup(key)
+        if node is None:
+            return default
+        return node.value
+
+    def setdefault(self, key: str, default: T = None) -> T:
+        """
+        Gets the value of key if it is cached and not expired, caching default first on a miss
+        :param key: key used to find the value
+        :param default: value cached on a miss
+        :return: value associated with key
+        """
+        hashed = _hash_string(key)
+        node = self._lookup(key, hashed)
+        if node is None:
+            self._insert(key, default, hashed)
+            return default
+        return node.value
+
+    def pop(self, key: str, default: T = _MISSING) -> T:
+        """
+        Removes key and returns its value, treating expired entries as missing
+        :param key: key of the entry to remove
+        :param default: value returned if key is not cached, KeyError is raised if not given
+        :return: value that was associated with key, or default
+        """
+        node = self._get(key)
+        if node is not None and node.expires is not None and node.expires <= time.monotonic():
+            self._expire(node)
+            node = None
+        if node is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = node.value
+        self._remove(node)
+        return value
+
+    def _increment(self, key: str, delta: T, hashed: int) -> T:
+        """
+        Adds delta to the cached value of key in place, caching delta on a miss
+        :param key: key of the entry to update
+        :param delta: amount added to the value
+        :param hashed: full hash of key
+        :return: new value associated with key
+        """
+        node = self._lookup(key, hashed)
+        if node is None:
+            self._insert(key, delta, hashed)
+            return delta
+        node.value += delta
+        if self.max_bytes is not None:
+            nbytes = self.sizeof(key, node.value)
+            self.nbytes += nbytes - node.nbytes
+            node.nbytes = nbytes
+            self._evict()
+        return node.value
+
+    def get_many(self, keys: Iterable[str], default: T = None) -> List[T]:
+        """
+        Looks up a batch of keys, hashing them all at once, counting hits and misses and refreshing recency
+        :param keys: Iterable of keys to look up
+        :param default: Value returned for keys that are not cached
+        :return: List of values in the same order as keys
+        """
+        keys = list(keys)
+        results = []
+        for key, hashed in zip(keys, _hash_strings(keys)):
+            node = self._lookup(key, hashed)
+            results.append(default if node is None else node.value)
+        return results
+
+    def _insert(self, key: str, value: T, hashed: int = None, ttl: float = None) -> None:
+        """
+        Uses Key Value parameters to add or update a CacheNode as the most recently used entry, then evicts least
+        recently used entries until the cache is within its limits
+        :param key: Key for CacheNode
+        :param value: Value for CacheNode
+        :param hashed: precomputed full hash of key, computed from key if not given
+        :param ttl: seconds the entry lives for, the table's default ttl if None
+        :return: None
+        """
+        if hashed is None:
+            hashed = _hash_string(key)
+        key_index = self._hash(key, True, hashed)
+        node = self.table[key_index]
+        if node is None or node.deleted is True:
+            if node is not None:
+                self.tombstones = self.tombstones - 1
+            self.size = self.size + 1
+            self.version = self.version + 1
+            node = CacheNode(key, value, False, hashed)
+            self.table[key_index] = node
+        else:
+            self._unlink(node)
+            self.nbytes -= node.nbytes
+            node.value = value
+        if ttl is None:
+            ttl = self.ttl
+        node.expires = None if ttl is None else time.monotonic() + ttl
+        node.nbytes = self.sizeof(key, value) if self.max_bytes is not None else 0
+        self.nbytes += node.nbytes
+        self._link(node)
+        if self.size >= (self.capacity / 2):
+            self._grow()
+        elif self.tombstones > self.capacity * self.TOMBSTONE_RATIO:
+            self._rehash(self.capacity)
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Removes least recently used entries until the cache is within max_entries and max_bytes
+        :return: None
+        """
+        head = self.head
+        while head.prev is not head and (
+                (self.max_entries is not None and self.size > self.max_entries)
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self.evictions += 1
+            self._remove(head.prev)
+
+    def _expire(self, node: CacheNode) -> None:
+        """
+        Removes an entry whose time to live has passed
+        :param node: expired CacheNode
+        :return: None
+        """
+        self.expirations += 1
+        self._remove(node)
+
+    def expire(self) -> int:
+        """
+        Removes every entry whose time to live has passed
+        :return: Number of entries removed
+        """
+        now = time.monotonic()
+        expired = [node for node in self._iter_nodes() if node.expires is not None and node.expires <= now]
+        for node in expired:
+            self._expire(node)
+        return len(expired)
+
+    def _remove(self, node: CacheNode) -> None:
+        """
+        Unlinks a node from the recency list and turns it into a tombstone
+        :param node: live CacheNode in this table
+        :return: None
+        """
+        self._unlink(node)
+        self.nbytes -= node.nbytes
+        super()._remove(node)
+
+    def _link(self, node: CacheNode) -> None:
+        """
+        Links a node in as the most recently used entry
+        :param node: CacheNode not currently in the recency list
+        :return: None
+        """
+        head = self.head
+        node.prev = head
+        node.next = head.next
+        head.next.prev = node
+        head.next = node
+
+    @staticmethod
+    def _unlink(node: CacheNode) -> None:
+        """
+        Takes a node out of the recency list
+        :param node: CacheNode in the recency list
+        :return: None
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node
+        node.next = node
+
+    def clear(self, shrink: bool = False) -> None:
+        """
+        Empties the cache, keeping its counters
+        :param shrink: bool indicating whether to release memory by shrinking the table to MIN_CAPACITY
+        :return: None
+        """
+        super().clear(shrink)
+        self.head = CacheNode(None, None)
+        self.nbytes = 0
+
+    def cache_info(self) -> dict:
+        """
+        Reports the cache's counters and usage
+        :return: dict of hits, misses, evictions, expirations, entries and bytes, where bytes is only measured
+        when max_bytes is set
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": self.size,
+            "bytes": self.nbytes,
+        }
+
+
+def _entry_size(key: str, value: T) -> int:
+    """
+    Default size measure of CacheTable entries
+    :param key: key of the entry
+    :param value: value of the entry
+    :return: shallow size of the key and value in bytes
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class HashCounter(HashTable):
+    """
+    Counter-style Hash Table mapping keys to counts, where missing keys count as zero and every count is updated
+    in place with a single probe sequence
+    """
+    __slots__ = []
+
+    def __init__(self, capacity: int = 8, iterable: Iterable[str] = None) -> None:
+        """
+        Initializes the counter
+        :param capacity: capacity of the hash table, rounded up to a power of two
+        :param iterable: Optional iterable of keys to count
+        """
+        super().__init__(capacity)
+        if iterable is not None:
+            self.count(iterable)
+
+    def __getitem__(self, key: str) -> int:
+        """
+        Gets the count of key
+        :param key: key being counted
+        :return: count of key, 0 if it has not been counted
+        """
+        node = self._get(key)
+        if node is None:
+            return 0
+        return node.value
+
+    def count(self, iterable: Iterable[str]) -> None:
+        """
+        Adds one to the count of every key in iterable, hashing keys in batches
+        :param iterable: Iterable of keys to count
+        :return: None
+        """
+        count = _length_hint(iterable)
+        if count:
+            self._reserve(self.size + count)
+        iterator = iter(iterable)
+        while True:
+            chunk = list(islice(iterator, _VECTORIZE_CHUNK))
+            if not chunk:
+                break
+            for key, hashed in zip(chunk, _hash_strings(chunk)):
+                self._increment(key, 1, hashed)
+
+    def most_common(self, n: int = None) -> List[Tuple[str, int]]:
+        """
+        Lists keys by descending count
+        :param n: number of keys to list, all of them if None
+        :return: list of (key, count) tuples, most common first
+        """
+        pairs = sorted(self.items(), key=lambda pair: pair[1], reverse=True)
+        return pairs if n is None else pairs[:n]
+
+
+class HashTableKeys:
+    """
+    Live view of the keys of a HashTable
+    """
+    __slots__ = ['table']
+
+    def __init__(self, table: HashTable) -> None:
+        """
+        Initializes the view
+        :param table: HashTable being viewed
+        """
+        self.table = table
+
+    def __len__(self) -> int:
+        """
+        Finds number of entries in the viewed table
+        :return: number of entries
+        """
+        return len(self.table)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterates over the viewed table without copying it
+        :return: iterator of keys
+        """
+        return self.table._iter_keys()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Determines if key is in the viewed table
+        :param key: Key being checked for
+        :return: Bool indicating whether the key was found
+        """
+        return key in self.table
+
+    def __str__(self) -> str:
+        """
+        Represents the view as a string
+        :return: string representation of the view
+        """
+        return f"{type(self).__name__}({list(self)})"
+
+    __repr__ = __str__
+
+
+class HashTableValues(HashTableKeys):
+    """
+    Live view of the values of a HashTable
+    """
+    __slots__ = []
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterates over the viewed table without copying it
+        :return: iterator of values
+        """
+        return self.table._iter_values()
+
+    def __contains__(self, value: T) -> bool:
+        """
+        Determines if value is in the viewed table, scanning every entry
+        :param value: Value being checked for
+        :return: Bool indicating whether the value was found
+        """
+        for item in self:
+            if item is value or item == value:
+                return True
+        return False
+
+
+class HashTableItems(HashTableKeys):
+    """
+    Live view of the key value pairs of a HashTable
+    """
+    __slots__ = []
+
+    def __iter__(self) -> Iterator[Tuple[str, T]]:
+        """
+        Iterates over the viewed table without copying it
+        :return: iterator of key value tuples
+        """
+        return self.table._iter_items()
+
+    def __contains__(self, item: Tuple[str, T]) -> bool:
+        """
+        Determines if a key value pair is in the viewed table
+        :param item: Key value tuple being checked for
+        :return: Bool indicating whether the key was found with an equal value
+        """
+        key, value = item
+        # Probed directly so subclass lookups, like HashCounter's default of 0 or CacheTable's hit counting, do
+        # not apply
+        node = self.table._get(key)
+        if node is None:
+            return False
+        return node.value is value or node.value == value
+
+
+def display_duplicates(data: List[List[str]], filenames: List[str]) -> HashTable:
+    """
+    Displays duplicate images represented by a HashTable, by placing duplicates in a list held in the value
+    of the hash node. Keys are the filenames of the first occurrence of an image.
+    Words for any duplicate string, but my use case was for image names. Runs in a single pass, in O(N) for N images.
+    :param data: A list of lists of four hash strings corresponding to the hash results of each image, rotated
+    by 0, 90, 180 and 270 degrees
+    :param filenames: Corresponding filenames of images whose hash info lies in data
+    :return: HashTable detailing image duplicate information
+    """
+    images = HashTable(_capacity_for(len(filenames)))
+    for filename, original in _match_originals(zip(filenames, data), len(filenames)):
+        if original is None:
+            images[filename] = []
+        else:
+            images._get(original).value.append(filename)
+    return images
+
+
+def stream_duplicates(records: Iterable[Tuple[str, List[str]]]) -> Iterator[Tuple[str, str]]:
+    """
+    Streaming version of display_duplicates that reports each duplicate as soon as its record is read, holding
+    only one canonical hash per distinct image in memory
+    :param records: Iterable of (filename, [h0, h1, h2, h3]) records, where the hashes are the image's hash
+    rotated by 0, 90, 180 and 270 degrees
+    :return: Generator of (original filename, duplicate filename) tuples, in the order duplicates are read
+    """
+    for filename, original in _match_originals(records):
+        if original is not None:
+            yield original, filename
+
+
+def _canonical_rotation(hashes: List[str]) -> str:
+    """
+    Builds a key shared by all four rotations of an image
+    :param hashes: The four hash strings of an image, rotated by 0, 90, 180 and 270 degrees
+    :return: The smallest of the four rotation orders, concatenated
+    """
+    h0, h1, h2, h3 = hashes
+    return "".join(min((h0, h1, h2, h3), (h1, h2, h3, h0), (h2, h3, h0, h1), (h3, h0, h1, h2)))
+
+
+def _match_originals(records: Iterable[Tuple[str, List[str]]],
+                     expected_size: int = None) -> Iterator[Tuple[str, str]]:
+    """
+    Pairs each image with the first earlier image that is a rotation of it
+    :param records: Iterable of (filename, [h0, h1, h2, h3]) records
+    :param expected_size: Number of records expected, used to size the table up front
+    :return: Generator of (filename, original filename) tuples, where the original is None for first occurrences
+    """
+    originals = HashTable(_capacity_for(expected_size or 0))
+    for filename, hashes in records:
+        key = _canonical_rotation(hashes)
+        hashed = _hash_string(key)
+        node = originals._get(key, hashed)
+        if node is None:
+            originals._insert(key, filename, hashed)
+            yield filename, None
+        else:
+            yield filename, node.value
+
+
+def get_permutations(words: List[str]) -> HashCounter:
+    """
+    A helper function for locate_substrings that creates a HashTable of each word in words
+    :param words: A list of strings to be added to a HashTable. The count of each word is its value.
+    :return: A hashtable with each word in words and their number of occurrences
+    """
+    return HashCounter(iterable=words)
+
+
+def compare_tables(hash_table1, hash_table2):
+    """
+    Compares two hash tables but does not terminate the program if one has None at the index that the other has
+    a Node
+    :param hash_table1: First HashTable to compare
+    :param hash_table2: Second HashTable to compare
+    :return: Bool representing whether the HashTables are equivalent
+    """
+    if len(hash_table1) != len(hash_table2):
+        return False
+
+    keys = hash_table1.keys()
+    for key in keys:
+        if key not in hash_table2:
+            return False
+
+    for key in keys:
+        if hash_table1[key] != hash_table2[key]:
+            return False
+
+    return True
+
+
+def locate_substrings(text: str, words: List[str]) -> List[int]:
+    """
+    Finds all the index positions within a string where permutations of a list of words exists in consecutive order,
+    use cases include searching for single or multiple words within a text in any consecutive order. Locates substring
+    in O(N * W), where N is the length of the text parameter and W is the length of each word within words, by sliding
+    a window of whole words across the text once for each of the W starting offsets. Has a constraint of requiring
+    words being searched for of the same length.
     :param text : A string that represents the text being searched.
     :param words: A list of strings that represents the words being searched for
     :return: A list of ints that contains the starting index of any permutation of words within text
@@ -469,18 +3145,173 @@ def locate_substrings(text: str, words: List[str]) -> List[int]:
     word_indices = []
     if len(words) == 0 or len(text) == 0:
         return word_indices
-    permutations = get_permutations(words)
     word_length = len(words[0])
-    total_length = len(words) * word_length
-
-    for i in range(len(text) - total_length + 1):
-        # Uses sliding window method to locate substrings
-        window = text[i:i + total_length]
-        window_words = []
-        for j in range(0, total_length, word_length):
-            word = window[j:j + word_length]
-            window_words.append(word)
-        window_table = get_permutations(window_words)
-        if compare_tables(permutations, window_table):
-            word_indices.append(i)
+    if word_length == 0:
+        return word_indices
+    word_count = len(words)
+    last_start = len(text) - word_length
+
+    # Counts of each word still missing from the current window, updated in place as the window slides
+    remaining = get_permutations(words)
+    # Nodes of the words currently in the window, oldest first, so leaving words need no second lookup
+    window = deque()
+
+    for offset in range(word_length):
+        left = offset
+        satisfied = 0
+        for right in range(offset, last_start + 1, word_length):
+            node = remaining._get(text[right:right + word_length])
+            if node is None:
+                # A word that is not searched for, so no match can span it
+                for window_node in window:
+                    window_node.value += 1
+                window.clear()
+                satisfied = 0
+                left = right + word_length
+                continue
+            node.value -= 1
+            window.append(node)
+            satisfied += 1
+            while node.value < 0:
+                window.popleft().value += 1
+                satisfied -= 1
+                left += word_length
+            if satisfied == word_count:
+                word_indices.append(left)
+                window.popleft().value += 1
+                satisfied -= 1
+                left += word_length
+        for window_node in window:
+            window_node.value += 1
+        window.clear()
+
+    word_indices.sort()
     return word_indices
+
+
+def locate_substrings_stream(source: Union[str, os.PathLike, BinaryIO, TextIO], words: List[str],
+                             chunk_size: int = 1 << 22, processes: int = None) -> Iterator[int]:
+    """
+    Streaming version of locate_substrings for texts too large to hold as a single string. The text is scanned in
+    chunks that overlap by one character less than a match, so no match is missed or reported twice. Files given by
+    path are memory-mapped and searched as bytes, as are binary file objects, in which case offsets are byte offsets
+    and words are matched against their UTF-8 encoding, which must have the same number of bytes for every word.
+    Text file objects are searched as characters.
+    :param source: Path of the file to search, or a file object opened in text or binary mode
+    :param words: A list of strings that represents the words being searched for
+    :param chunk_size: Number of characters or bytes read at a time
+    :param processes: Number of worker processes to split a file given by path across, or None to search serially
+    :return: Generator of the starting offsets of any permutation of words within the text, in increasing order
+    :raises ValueError: if the source is searched as bytes and the words differ in UTF-8 length
+    """
+    if len(words) == 0:
+        return
+    if isinstance(source, (str, os.PathLike)):
+        words = _byte_words(words)
+        if processes:
+            yield from _locate_in_file_parallel(source, words, chunk_size, processes)
+        else:
+            yield from _locate_in_chunks(_mapped_chunks(source, chunk_size), words)
+    else:
+        if processes:
+            raise ValueError("processes requires source to be a file path")
+        empty = source.read(0)
+        chunks = iter(lambda: source.read(chunk_size), empty)
+        if isinstance(empty, bytes):
+            words = _byte_words(words)
+            chunks = map(_byte_text, chunks)
+        yield from _locate_in_chunks(chunks, words)
+
+
+def _byte_text(text: Union[str, bytes]) -> str:
+    """
+    Converts text to the one character per byte form that byte sources are searched in
+    :param text: bytes, or a string which is encoded as UTF-8 first
+    :return: string with one character for each byte
+    """
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    return text.decode("latin-1")
+
+
+def _byte_words(words: List[str]) -> List[str]:
+    """
+    Converts the words searched for to byte form, checking they still share one length
+    :param words: A list of strings that represents the words being searched for
+    :return: List of the words in byte form
+    :raises ValueError: if the UTF-8 encodings of the words differ in length
+    """
+    words = [_byte_text(word) for word in words]
+    if any(len(word) != len(words[0]) for word in words):
+        raise ValueError("words must have the same UTF-8 length to be searched for in bytes")
+    return words
+
+
+def _mapped_chunks(path: Union[str, os.PathLike], chunk_size: int) -> Iterator[str]:
+    """
+    Memory-maps a file and yields it in consecutive chunks, copying only one chunk at a time
+    :param path: Path of the file
+    :param chunk_size: Number of bytes per chunk
+    :return: Generator of chunks of the file, in byte form
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_size):
+                yield _byte_text(mapped[start:start + chunk_size])
+
+
+def _locate_in_chunks(chunks: Iterator[str], words: List[str]) -> Iterator[int]:
+    """
+    Runs locate_substrings over consecutive chunks of a text, carrying the last total_length - 1 characters of
+    each chunk into the next. The carried tail is too short to hold a match by itself, so every match is found
+    exactly once
+    :param chunks: Iterator of consecutive pieces of the text
+    :param words: A list of strings that represents the words being searched for
+    :return: Generator of absolute starting offsets of matches
+    """
+    total_length = len(words) * len(words[0])
+    carry = ""
+    base = 0
+    for chunk in chunks:
+        window = carry + chunk
+        for index in locate_substrings(window, words):
+            yield base + index
+        carry = window[max(len(window) - total_length + 1, 0):] if total_length > 1 else ""
+        base += len(window) - len(carry)
+
+
+def _locate_in_range(path: Union[str, os.PathLike], start: int, stop: int, words: List[str]) -> List[int]:
+    """
+    Worker for _locate_in_file_parallel that finds the matches starting between two byte offsets of a file
+    :param path: Path of the file
+    :param start: First byte offset a match may start at
+    :param stop: Byte offset that matches must start before
+    :param words: A list of strings, in byte form, that represents the words being searched for
+    :return: List of absolute starting offsets of matches
+    """
+    total_length = len(words) * len(words[0])
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = _byte_text(mapped[start:stop + total_length - 1])
+    return [start + index for index in locate_substrings(text, words) if index < stop - start]
+
+
+def _locate_in_file_parallel(path: Union[str, os.PathLike], words: List[str], chunk_size: int,
+                             processes: int) -> Iterator[int]:
+    """
+    Splits a file into chunks searched by a pool of worker processes, yielding their matches in order
+    :param path: Path of the file
+    :param words: A list of strings, in byte form, that represents the words being searched for
+    :param chunk_size: Number of bytes each worker task covers
+    :param processes: Number of worker processes
+    :return: Generator of absolute starting offsets of matches
+    """
+    size = os.path.getsize(path)
+    starts = range(0, size, chunk_size)
+    stops = [min(start + chunk_size, size) for start in starts]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = executor.map(_locate_in_range, [path] * len(starts), starts, stops, [words] * len(starts))
+        for indices in results:
+            yield from indices
@@ -0,0 +1,55 @@
+"""
+Batch lookup benchmark for HashTable
+Compares get_many and contains_many on a batch of keys against calling __getitem__ and __contains__ in a loop
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Custom_Hash_Table import HashTable, CompactHashTable, np  # noqa: E402
+
+
+def best_of(repeat: int, fn) -> float:
+    """
+    Runs fn repeat times
+    :param repeat: number of runs
+    :param fn: zero argument callable to time
+    :return: fastest run time in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=10_000, help="number of keys per batch")
+    parser.add_argument("--key-length", type=int, default=256, help="characters per key")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement, the fastest is reported")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    keys = ["".join(rng.choice("0123456789abcdef") for _ in range(args.key_length)) for _ in range(args.batch)]
+    print(f"batch={args.batch} key_length={args.key_length} numpy={'yes' if np is not None else 'no'}")
+
+    for cls in (HashTable, CompactHashTable):
+        table = cls()
+        table.set_many((key, i) for i, key in enumerate(keys))
+        loop_get = best_of(args.repeat, lambda: [table[key] for key in keys])
+        batch_get = best_of(args.repeat, lambda: table.get_many(keys))
+        loop_contains = best_of(args.repeat, lambda: [key in table for key in keys])
+        batch_contains = best_of(args.repeat, lambda: table.contains_many(keys))
+        print(f"{cls.__name__:>17} get: {args.batch / loop_get:>12,.0f} -> {args.batch / batch_get:>12,.0f} keys/s "
+              f"({loop_get / batch_get:.1f}x)   contains: {loop_contains / batch_contains:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Multi-threaded contention benchmark
+Compares a HashTable behind one global lock with a ConcurrentHashTable under read-heavy and write-heavy mixes.
+With the GIL only one thread runs Python code at a time, so expect the two to be within noise of each other there;
+sharding can only scale on a free-threaded build
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Custom_Hash_Table import HashTable, ConcurrentHashTable  # noqa: E402
+
+
+class GlobalLockTable:
+    """
+    HashTable wrapped in a single lock, the baseline being compared against
+    """
+
+    def __init__(self) -> None:
+        self.table = HashTable()
+        self.lock = threading.Lock()
+
+    def __setitem__(self, key: str, value: int) -> None:
+        with self.lock:
+            self.table[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            return key in self.table
+
+
+def worker(table, keys: list, operations: int, write_ratio: float, seed: int) -> None:
+    """
+    Runs a random mix of reads and writes against table
+    :param table: table under test
+    :param keys: key space to draw from
+    :param operations: number of operations to run
+    :param write_ratio: fraction of operations that are writes
+    :param seed: seed for this worker's random choices
+    :return: None
+    """
+    rng = random.Random(seed)
+    for i in range(operations):
+        key = keys[rng.randrange(len(keys))]
+        if rng.random() < write_ratio:
+            table[key] = i
+        else:
+            key in table
+
+
+def run(factory, threads: int, keys: list, operations: int, write_ratio: float) -> float:
+    """
+    Times threads workers running concurrently against a table pre-filled with half of keys
+    :return: operations per second across all threads
+    """
+    table = factory()
+    for i, key in enumerate(keys[::2]):
+        table[key] = i
+    workers = [threading.Thread(target=worker, args=(table, keys, operations, write_ratio, seed))
+               for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to run")
+    parser.add_argument("--keys", type=int, default=100_000, help="size of the key space")
+    parser.add_argument("--operations", type=int, default=50_000, help="operations per thread")
+    parser.add_argument("--shards", type=int, default=16, help="shards in the ConcurrentHashTable")
+    args = parser.parse_args()
+
+    keys = [f"session-{i:08d}" for i in range(args.keys)]
+    mixes = (("read-heavy", 0.1), ("write-heavy", 0.5))
+    print(f"{'mix':>12} {'threads':>8} {'global lock ops/s':>18} {'sharded ops/s':>14}")
+    for name, write_ratio in mixes:
+        for threads in args.threads:
+            baseline = run(GlobalLockTable, threads, keys, args.operations, write_ratio)
+            sharded = run(lambda: ConcurrentHashTable(args.shards), threads, keys, args.operations, write_ratio)
+            print(f"{name:>12} {threads:>8} {baseline:>18,.0f} {sharded:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
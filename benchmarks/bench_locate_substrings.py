@@ -0,0 +1,60 @@
+"""
+Benchmark for locate_substrings
+Searches a multi-megabyte text built from a small vocabulary for every permutation of K words
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Custom_Hash_Table import locate_substrings  # noqa: E402
+
+
+def make_text(size: int, vocabulary: list, words: list, rng: random.Random) -> str:
+    """
+    Builds a text of random vocabulary words, occasionally inserting a shuffled copy of words so there are matches
+    :param size: approximate length of the text in characters
+    :param vocabulary: words the text is drawn from
+    :param words: words being searched for
+    :param rng: random number generator
+    :return: generated text
+    """
+    parts = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.001:
+            match = words[:]
+            rng.shuffle(match)
+            part = "".join(match)
+        else:
+            part = rng.choice(vocabulary)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=4.0, help="size of the text in millions of characters")
+    parser.add_argument("--words", type=int, default=100, help="number of words searched for (K)")
+    parser.add_argument("--word-length", type=int, default=5, help="length of each word (W)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = ["".join(rng.choice("abcdefghij") for _ in range(args.word_length)) for _ in range(args.words * 2)]
+    words = [rng.choice(vocabulary) for _ in range(args.words)]
+    text = make_text(int(args.megabytes * 1_000_000), vocabulary, words, rng)
+
+    start = time.perf_counter()
+    matches = locate_substrings(text, words)
+    elapsed = time.perf_counter() - start
+    print(f"text={len(text):,} chars  K={args.words}  W={args.word_length}  matches={len(matches)}")
+    print(f"{elapsed:.2f} s  ({len(text) / elapsed / 1e6:.2f} M chars/s)")
+
+
+if __name__ == "__main__":
+    main()
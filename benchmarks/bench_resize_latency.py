@@ -0,0 +1,81 @@
+"""
+Insert latency distribution benchmark
+Times every insert into a HashTable, which rehashes all entries when it doubles, and an IncrementalHashTable,
+which moves them across over later inserts, reporting the latency percentiles and the slowest insert at each
+size, the lowest across several runs, so growth spikes show up. The built-in dict, which resizes all at once in C,
+is included for reference
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Custom_Hash_Table import HashTable, IncrementalHashTable  # noqa: E402
+
+
+def latencies(factory, keys: list) -> list:
+    """
+    Times each insert of keys into a new table individually
+    :param factory: zero argument callable making the table
+    :param keys: keys to insert
+    :return: list of insert times in nanoseconds, in insertion order
+    """
+    table = factory()
+    timer = time.perf_counter_ns
+    times = [0] * len(keys)
+    gc.disable()
+    try:
+        for i, key in enumerate(keys):
+            start = timer()
+            table[key] = i
+            times[i] = timer() - start
+    finally:
+        gc.enable()
+    assert len(table) == len(keys)
+    return times
+
+
+def percentile(ordered: list, fraction: float) -> int:
+    """
+    Picks a percentile from sorted samples by nearest rank
+    :param ordered: sorted samples
+    :param fraction: percentile as a fraction between 0 and 1
+    :return: sample at that percentile
+    """
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2_000_000, help="number of keys inserted")
+    parser.add_argument("--steps", type=int, default=8, help="number of sizes the slowest insert is reported at")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per table, the slowest insert at each size is the lowest across runs")
+    args = parser.parse_args()
+
+    keys = [f"key-{i:010d}" for i in range(args.size)]
+    boundaries = [args.size >> shift for shift in range(args.steps - 1, -1, -1)]
+    print("Slowest inserts are the lowest across runs, to filter out pauses of the machine itself.\n"
+          "IncrementalHashTable's worst case is still O(capacity): the inserts that start and finish a grow\n"
+          "allocate and free a whole slot list in C, so its slowest insert still doubles with the table, far below\n"
+          "HashTable's full rehash.\n")
+    for name, factory in (("HashTable", HashTable), ("IncrementalHashTable", IncrementalHashTable),
+                          ("dict", dict)):
+        runs = [latencies(factory, keys) for _ in range(args.repeat)]
+        ordered = sorted(runs[0])
+        print(f"{name}: p50 {percentile(ordered, 0.5) / 1e3:.2f} us, p99 {percentile(ordered, 0.99) / 1e3:.2f} us, "
+              f"p99.9 {percentile(ordered, 0.999) / 1e3:.2f} us")
+        print(f"{'keys':>12} {'slowest insert ms':>18}")
+        previous = 0
+        for boundary in boundaries:
+            slowest = min(max(times[previous:boundary]) for times in runs)
+            print(f"{boundary:>12} {slowest / 1e6:>18.3f}")
+            previous = boundary
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Scaling benchmark for HashTable
+Inserts and looks up 10^3 through 10^7 keys, reporting the time per operation at each size
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Custom_Hash_Table import HashTable  # noqa: E402
+
+
+def run(size: int) -> dict:
+    """
+    Times inserting and then looking up size distinct keys
+    :param size: number of keys
+    :return: dict of timings for this size
+    """
+    keys = [f"key-{i:010d}" for i in range(size)]
+    table = HashTable()
+
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        table[key] = i
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        table[key]
+    lookup_time = time.perf_counter() - start
+
+    assert len(table) == size
+    return {
+        "size": size,
+        "capacity": table.capacity,
+        "insert_us": insert_time / size * 1e6,
+        "lookup_us": lookup_time / size * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--min-exp", type=int, default=3, help="smallest size as a power of ten")
+    parser.add_argument("--max-exp", type=int, default=7, help="largest size as a power of ten")
+    args = parser.parse_args()
+
+    print(f"{'keys':>10} {'capacity':>10} {'insert us/op':>13} {'lookup us/op':>13}")
+    for exp in range(args.min_exp, args.max_exp + 1):
+        result = run(10 ** exp)
+        print(f"{result['size']:>10} {result['capacity']:>10} {result['insert_us']:>13.3f} {result['lookup_us']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
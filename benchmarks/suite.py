@@ -0,0 +1,439 @@
+"""
+Benchmark suite comparing HashTable against the built-in dict
+Runs every workload at several sizes and key distributions, reporting ops/sec and peak traced memory for both, and
+writes the results as JSON so runs of different versions can be compared with --compare
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from itertools import product
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Custom_Hash_Table import HashTable, locate_substrings, display_duplicates  # noqa: E402
+
+# Two character blocks with equal polynomial hashes: 181 * ord("b") + ord("w") == 181 * ord("a") + 300.
+# Every key made of the same number of these blocks collides completely under _hash_1 and _hash_2
+COLLIDING_BLOCKS = ("bw", "a" + chr(300))
+
+
+def random_keys(size: int, rng: random.Random) -> list:
+    """
+    Makes random twelve character alphanumeric keys
+    :param size: number of keys
+    :param rng: random number generator to draw from
+    :return: list of keys
+    """
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(12)) for _ in range(size)]
+
+
+def sequential_keys(size: int, rng: random.Random) -> list:
+    """
+    Makes keys sharing a long prefix and differing only in a counter
+    :param size: number of keys
+    :param rng: unused, kept so every distribution takes the same arguments
+    :return: list of keys
+    """
+    return [f"user:session:{i:012d}" for i in range(size)]
+
+
+def long_keys(size: int, rng: random.Random) -> list:
+    """
+    Makes random 256 character hexadecimal keys
+    :param size: number of keys
+    :param rng: random number generator to draw from
+    :return: list of keys
+    """
+    return ["".join(rng.choice("0123456789abcdef") for _ in range(256)) for _ in range(size)]
+
+
+def adversarial_keys(size: int, rng: random.Random) -> list:
+    """
+    Makes keys built from COLLIDING_BLOCKS that all share one hash
+    :param size: number of keys
+    :param rng: unused, kept so every distribution takes the same arguments
+    :return: list of keys
+    """
+    blocks = max(size - 1, 1).bit_length()
+    keys = []
+    for combination in product(COLLIDING_BLOCKS, repeat=blocks):
+        keys.append("".join(combination))
+        if len(keys) == size:
+            break
+    return keys
+
+
+DISTRIBUTIONS = {
+    "random": random_keys,
+    "sequential": sequential_keys,
+    "long": long_keys,
+    "adversarial": adversarial_keys,
+}
+
+
+def filled(factory, keys: list):
+    """
+    Makes a table holding keys, each mapped to its position
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert
+    :return: the filled table
+    """
+    table = factory()
+    for i, key in enumerate(keys):
+        table[key] = i
+    return table
+
+
+def insert(factory, keys: list):
+    """
+    Prepares inserting keys into a new table
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert
+    :return: callable running the workload and returning the number of operations
+    """
+    def run():
+        table = factory()
+        for i, key in enumerate(keys):
+            table[key] = i
+        return len(keys)
+    return run
+
+
+def hit_lookup(factory, keys: list):
+    """
+    Prepares looking up every key of a filled table
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert and look up
+    :return: callable running the workload and returning the number of operations
+    """
+    table = filled(factory, keys)
+
+    def run():
+        for key in keys:
+            table[key]
+        return len(keys)
+    return run
+
+
+def miss_lookup(factory, keys: list):
+    """
+    Prepares checking a filled table for keys it does not hold
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert, each checked for with a suffix appended
+    :return: callable running the workload and returning the number of operations
+    """
+    table = filled(factory, keys)
+    missing = [key + "#" for key in keys]
+
+    def run():
+        for key in missing:
+            key in table
+        return len(missing)
+    return run
+
+
+def churn(factory, keys: list):
+    """
+    Prepares rounds of inserting and deleting keys, which leave tombstones behind
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert and delete
+    :return: callable running the workload and returning the number of operations
+    """
+    half = len(keys) // 2
+
+    def run():
+        table = factory()
+        operations = 0
+        for _ in range(4):
+            for i, key in enumerate(keys[:half]):
+                table[key] = i
+            for key in keys[:half]:
+                del table[key]
+            for key in keys[half:]:
+                table[key] = 0
+                del table[key]
+            operations += 2 * len(keys)
+        return operations
+    return run
+
+
+def bulk_update(factory, keys: list):
+    """
+    Prepares loading keys into a new table with a single update call
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert
+    :return: callable running the workload and returning the number of operations
+    """
+    pairs = [(key, i) for i, key in enumerate(keys)]
+
+    def run():
+        table = factory()
+        table.update(pairs)
+        return len(pairs)
+    return run
+
+
+def iterate_items(factory, keys: list):
+    """
+    Prepares iterating over the items of a filled table
+    :param factory: zero argument callable making an empty table
+    :param keys: keys to insert
+    :return: callable running the workload and returning the number of operations
+    """
+    table = filled(factory, keys)
+
+    def run():
+        count = 0
+        for _ in table.items():
+            count += 1
+        return count
+    return run
+
+
+KEY_WORKLOADS = {
+    "insert": insert,
+    "hit_lookup": hit_lookup,
+    "miss_lookup": miss_lookup,
+    "churn": churn,
+    "update": bulk_update,
+    "items": iterate_items,
+}
+
+
+def dict_locate_substrings(text: str, words: list) -> list:
+    """
+    dict-based sliding window reference for locate_substrings
+    :param text: text being searched
+    :param words: words being searched for, all of the same length
+    :return: sorted starting indices of every permutation of words within text
+    """
+    word_length = len(words[0])
+    remaining = {}
+    for word in words:
+        remaining[word] = remaining.get(word, 0) + 1
+    indices = []
+    for offset in range(word_length):
+        window = []
+        left = offset
+        for right in range(offset, len(text) - word_length + 1, word_length):
+            word = text[right:right + word_length]
+            if word not in remaining:
+                for seen in window:
+                    remaining[seen] += 1
+                window.clear()
+                left = right + word_length
+                continue
+            remaining[word] -= 1
+            window.append(word)
+            while remaining[word] < 0:
+                remaining[window.pop(0)] += 1
+                left += word_length
+            if len(window) == len(words):
+                indices.append(left)
+                remaining[window.pop(0)] += 1
+                left += word_length
+        for seen in window:
+            remaining[seen] += 1
+    return sorted(indices)
+
+
+def dict_display_duplicates(data: list, filenames: list) -> dict:
+    """
+    dict-based canonical rotation reference for display_duplicates
+    :param data: four hashes per image, one for each rotation
+    :param filenames: filename of each image
+    :return: dict mapping each original filename to the filenames of its duplicates
+    """
+    originals = {}
+    images = {}
+    for filename, (h0, h1, h2, h3) in zip(filenames, data):
+        key = "".join(min((h0, h1, h2, h3), (h1, h2, h3, h0), (h2, h3, h0, h1), (h3, h0, h1, h2)))
+        if key in originals:
+            images[originals[key]].append(filename)
+        else:
+            originals[key] = filename
+            images[filename] = []
+    return images
+
+
+def substrings(implementation, size: int, rng: random.Random):
+    """
+    Prepares searching generated text for permutations of ten words
+    :param implementation: name of the implementation, HashTable or dict
+    :param size: number of words in the text
+    :param rng: random number generator to draw the text from
+    :return: callable running the workload and returning the number of characters searched
+    """
+    vocabulary = ["".join(rng.choice("abcdef") for _ in range(4)) for _ in range(40)]
+    words = vocabulary[:10]
+    text = "".join(rng.choice(vocabulary) for _ in range(size))
+    function = locate_substrings if implementation == "HashTable" else dict_locate_substrings
+
+    def run():
+        function(text, words)
+        return len(text)
+    return run
+
+
+def duplicates(implementation, size: int, rng: random.Random):
+    """
+    Prepares finding duplicate images among generated hashes, a fifth of which are rotations of earlier ones
+    :param implementation: name of the implementation, HashTable or dict
+    :param size: number of images
+    :param rng: random number generator to draw the hashes from
+    :return: callable running the workload and returning the number of images
+    """
+    data = []
+    for _ in range(size):
+        if data and rng.random() < 0.2:
+            hashes = rng.choice(data)
+            turn = rng.randrange(4)
+            data.append(hashes[turn:] + hashes[:turn])
+        else:
+            data.append(["".join(rng.choice("0123456789abcdef") for _ in range(16)) for _ in range(4)])
+    filenames = [f"image_{i:08d}.png" for i in range(size)]
+    function = display_duplicates if implementation == "HashTable" else dict_display_duplicates
+
+    def run():
+        function(data, filenames)
+        return size
+    return run
+
+
+TEXT_WORKLOADS = {
+    "locate_substrings": substrings,
+    "display_duplicates": duplicates,
+}
+
+IMPLEMENTATIONS = {"HashTable": HashTable, "dict": dict}
+
+
+def measure(prepare, repeat: int) -> dict:
+    """
+    Times the best of repeat runs, then traces the peak memory of one more run including its setup
+    :param prepare: zero argument callable that sets up the workload and returns the callable to time
+    :param repeat: number of timed runs
+    :return: dict with ops_per_sec and peak_bytes
+    """
+    best = None
+    for _ in range(repeat):
+        run = prepare()
+        gc.collect()
+        start = time.perf_counter()
+        operations = run()
+        elapsed = time.perf_counter() - start
+        rate = operations / elapsed if elapsed > 0 else float("inf")
+        best = rate if best is None else max(best, rate)
+    gc.collect()
+    tracemalloc.start()
+    prepare()()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ops_per_sec": best, "peak_bytes": peak}
+
+
+def run_suite(sizes: list, distributions: list, workloads: list, repeat: int, adversarial_max: int) -> list:
+    """
+    Measures every workload at every size and key distribution for each implementation, printing each result
+    :param sizes: numbers of keys to run at
+    :param distributions: names of the key distributions to run
+    :param workloads: names of the workloads to run
+    :param repeat: number of timed runs per measurement
+    :param adversarial_max: largest size run with adversarial keys
+    :return: list of result dicts
+    """
+    results = []
+    for size in sizes:
+        for distribution in distributions:
+            if distribution == "adversarial" and size > adversarial_max:
+                continue
+            keys = DISTRIBUTIONS[distribution](size, random.Random(size))
+            for workload in workloads:
+                if workload not in KEY_WORKLOADS:
+                    continue
+                for name, factory in IMPLEMENTATIONS.items():
+                    result = measure(lambda: KEY_WORKLOADS[workload](factory, keys), repeat)
+                    results.append({"workload": workload, "distribution": distribution, "size": size,
+                                    "implementation": name, **result})
+                    report(results[-1])
+        for workload in workloads:
+            if workload not in TEXT_WORKLOADS:
+                continue
+            for name in IMPLEMENTATIONS:
+                result = measure(lambda: TEXT_WORKLOADS[workload](name, size, random.Random(size)), repeat)
+                results.append({"workload": workload, "distribution": "generated", "size": size,
+                                "implementation": name, **result})
+                report(results[-1])
+    return results
+
+
+def report(result: dict) -> None:
+    """
+    Prints one result as a table row
+    :param result: result dict from run_suite
+    :return: None
+    """
+    print(f"{result['workload']:>18} {result['distribution']:>11} {result['size']:>9} {result['implementation']:>9} "
+          f"{result['ops_per_sec']:>14,.0f} ops/s {result['peak_bytes'] / 1e6:>10.2f} MB", flush=True)
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> int:
+    """
+    Prints every HashTable result that is slower than in a baseline JSON file by more than threshold
+    :param results: result dicts from run_suite
+    :param baseline_path: path of a results JSON file written by an earlier run with --json
+    :param threshold: slowdown fraction reported as a regression
+    :return: number of regressions found
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)["results"]
+    previous = {(r["workload"], r["distribution"], r["size"], r["implementation"]): r for r in baseline}
+    regressions = 0
+    for result in results:
+        old = previous.get((result["workload"], result["distribution"], result["size"], result["implementation"]))
+        if old is None or result["implementation"] != "HashTable":
+            continue
+        ratio = result["ops_per_sec"] / old["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions += 1
+            print(f"REGRESSION {result['workload']} {result['distribution']} {result['size']}: "
+                  f"{old['ops_per_sec']:,.0f} -> {result['ops_per_sec']:,.0f} ops/s ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    """
+    Runs the suite from the command line, exiting with status 1 if --compare finds a regression
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    parser.add_argument("--workloads", nargs="+", default=list(KEY_WORKLOADS) + list(TEXT_WORKLOADS),
+                        choices=list(KEY_WORKLOADS) + list(TEXT_WORKLOADS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per measurement, the best is kept")
+    parser.add_argument("--adversarial-max", type=int, default=2_000,
+                        help="largest size run with adversarial keys, whose operations cost O(n) each")
+    parser.add_argument("--json", help="path to write the results to")
+    parser.add_argument("--compare", help="results JSON from a previous run to check for regressions against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown fraction reported as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.distributions, args.workloads, args.repeat, args.adversarial_max)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results},
+                      file, indent=2)
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()